@@ -0,0 +1,89 @@
+# Frame loop throughput with the hand detector inline versus in a worker
+# process (virtual_keyboard.detector_process). Replays a video through the
+# full pipeline of a style - detection, hit-test, rendering - with no window
+# and no key output, once per mode, and reports loop FPS, detections per
+# second and how stale the hands were.
+#
+#   python benchmarks/bench_detector_process.py session.mp4 --style modern
+#   python benchmarks/bench_detector_process.py session.mp4 --synthetic 25
+#
+# --synthetic MS swaps the hand detector for one that holds the GIL for MS
+# milliseconds and finds nothing: the loop and handoff costs without
+# mediapipe, and the worst case for a detector in a thread.
+import argparse
+import os
+import sys
+from functools import partial
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from virtual_keyboard import STAGES, STYLES, build
+from virtual_keyboard.detector_process import ProcessHandDetector
+from virtual_keyboard.hand_tracking import close_detector
+from virtual_keyboard.headless import ManualClock, NullDisplay, VideoReplay
+from virtual_keyboard.key_output import NullOutput
+from virtual_keyboard.perf_stats import StageTimer
+
+
+# Stand-in detector that burns CPU in Python for a fixed time
+class BusyHandDetector():
+    def __init__(self, ms):
+        self.seconds = ms / 1000
+
+    def findHands(self, img, draw=False):
+        end = perf_counter() + self.seconds
+        while perf_counter() < end:
+            pass
+        return [], img
+
+
+def run(args, mode):
+    clock = ManualClock()
+    detector = None
+    if args.synthetic:
+        detector = partial(BusyHandDetector, args.synthetic)
+        detector = ProcessHandDetector(detector) if mode == "process" else detector()
+    perf = StageTimer(STAGES, size=4096)
+    keyboard = build(args.style, cap=VideoReplay(args.video, clock), detector=detector, output=NullOutput(),
+                     display=NullDisplay(), clock=clock, perf=perf, budget=None,
+                     detector_process=mode == "process", latency_export=None, perf_dump=None)
+    detector = keyboard.detector
+    if hasattr(detector, "wait_ready"):
+        # Let the model load first (in the worker or in the background) so startup isn't timed
+        detector.wait_ready()
+
+    frames = 0
+    start = perf_counter()
+    while frames < args.frames:
+        if keyboard.step() is None:
+            break
+        frames += 1
+    elapsed = perf_counter() - start
+    detections = detector.detections if mode == "process" else frames
+    age = detector.mean_result_age() if mode == "process" else 0.0
+    detect_ms = perf.summary()["detect"]["p50_ms"]
+    close_detector(detector)
+    keyboard.capture.release()
+    return frames, elapsed, detections, age, detect_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame loop throughput with inline and process detection")
+    parser.add_argument("video", help="Recorded video")
+    parser.add_argument("--style", choices=list(STYLES), default="modern")
+    parser.add_argument("--frames", type=int, default=300, help="Maximum frames per run")
+    parser.add_argument("--synthetic", type=float, help="Use a CPU-bound stand-in detector taking this many ms")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'frames':>6} {'loop FPS':>9} {'detect/s':>9} {'detect p50':>11} {'hand age':>9}")
+    results = {}
+    for mode in ("inline", "process"):
+        frames, elapsed, detections, age, detect_ms = results[mode] = run(args, mode)
+        print(f"{mode:<8} {frames:>6} {frames / elapsed:>9.1f} {detections / elapsed:>9.1f} "
+              f"{detect_ms:>8.2f} ms {age:>6.2f} fr")
+    inline, process = results["inline"], results["process"]
+    print(f"Loop throughput: {(process[0] / process[1]) / (inline[0] / inline[1]):.2f}x with the detector process")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Gesture engine throughput and frame-rate independence. Drives
+# gesture_engine.GestureEngine with synthetic frames - a fingertip wandering
+# over the keys and pinching now and then - and reports how many frames per
+# second step() gets through, then how long a pinch takes to type a key at
+# several frame rates, next to the old rule of 5 consecutive pinch frames.
+#
+#   python benchmarks/bench_gesture_engine.py
+#   python benchmarks/bench_gesture_engine.py --frames 2000000 --keys 40
+import argparse
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from virtual_keyboard.gesture_engine import COMMITTED, INITIAL, GestureEngine
+
+OLD_HOLD_FRAMES = 5  # Consecutive pinch frames the frame-counted hold needed
+
+
+# Frame times, keys under the fingertip and pinch flags of a synthetic session:
+# the fingertip rests on a key for a while or is off the keyboard, the hand
+# pinches in bursts and drops out of detection now and then
+def synthetic_session(frames, fps, keys, seed=0):
+    rng = np.random.default_rng(seed)
+    times = np.arange(frames) / fps
+    dwell = rng.integers(3, 30, frames // 3 + 1)
+    key = np.repeat(rng.integers(-1, keys, len(dwell)), dwell)[:frames]
+    pinch = np.repeat(rng.random(len(dwell)) < 0.4, dwell)[:frames]
+    dropout = rng.random(frames) < 0.02
+    pinching = np.where(dropout, None, pinch).tolist()
+    return times.tolist(), key.tolist(), pinching
+
+
+def throughput(engine, session):
+    times, keys, pinching = session
+    step = engine.step
+    state = INITIAL
+    commits = 0
+    start = perf_counter()
+    for now, key, pinch in zip(times, keys, pinching):
+        state = step(state, now, key, pinch)
+        if state.phase is COMMITTED:
+            commits += 1
+    return perf_counter() - start, commits
+
+
+# Milliseconds from the pinch closing over a key to the key being typed
+def hold_latency(engine, fps):
+    state = INITIAL
+    frame = 0
+    while state.phase is not COMMITTED:
+        state = engine.step(state, frame / fps, 0, True)
+        frame += 1
+    return (frame - 1) / fps * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gesture engine throughput and hold latency")
+    parser.add_argument("--frames", type=int, default=1000000, help="Synthetic frames to step through")
+    parser.add_argument("--keys", type=int, default=46, help="Keys on the synthetic keyboard")
+    args = parser.parse_args()
+
+    engine = GestureEngine()
+    session = synthetic_session(args.frames, 30.0, args.keys)
+    elapsed, commits = throughput(engine, session)
+    print(f"{args.frames} frames in {elapsed:.2f} s: {args.frames / elapsed / 1e6:.2f} M frames/s, "
+          f"{elapsed / args.frames * 1e9:.0f} ns/frame, {commits} keys typed")
+
+    print(f"{'FPS':>5} {'time-based hold':>16} {'5-frame hold':>13}")
+    for fps in (15, 20, 30, 60, 100):
+        old = (OLD_HOLD_FRAMES - 1) / fps * 1000
+        print(f"{fps:>5} {hold_latency(engine, fps):>13.0f} ms {old:>10.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Detection latency and landmark error of the reduced-resolution inference path.
+#
+# Runs the hand detector over a recorded video at full resolution (the
+# reference) and at each inference scale, then reports findHands latency and
+# the landmark error against the full-resolution landmarks.
+#
+#   python benchmarks/bench_inference_scale.py hands.mp4 --scales 0.75 0.5 0.33 0.25
+import argparse
+import os
+import sys
+from time import perf_counter
+
+import cv2
+import numpy as np
+from cvzone.HandTrackingModule import HandDetector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from virtual_keyboard.hand_tracking import ScaledHandDetector
+
+
+def load_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        success, img = cap.read()
+        if not success:
+            break
+        frames.append(cv2.flip(img, 1))
+    cap.release()
+    return frames
+
+
+# Landmarks (or None) and findHands latency in ms for every frame at one scale
+def run(frames, scale):
+    frame_h, frame_w = frames[0].shape[:2]
+    size = (max(int(frame_w * scale), 32), max(int(frame_h * scale), 32))
+    # A fresh detector per scale so the tracker state of one run can't help another
+    detector = ScaledHandDetector(HandDetector(detectionCon=0.9, maxHands=1), size)
+    landmarks, latencies = [], []
+    for img in frames:
+        start = perf_counter()
+        hands, _ = detector.findHands(img)
+        latencies.append((perf_counter() - start) * 1000)
+        landmarks.append(np.array(hands[0]["lmList"], np.float64)[:, :2] if hands else None)
+    return landmarks, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand detector latency and landmark error per inference scale")
+    parser.add_argument("video", help="Recorded video with a hand in view")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.75, 0.5, 0.33, 0.25])
+    parser.add_argument("--frames", type=int, default=300, help="Maximum frames to use")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        sys.exit(f"No frames read from {args.video}")
+
+    reference, ref_latency = run(frames, 1.0)
+    print(f"{len(frames)} frames at {frames[0].shape[1]}x{frames[0].shape[0]}")
+    print(f"{'scale':>6} {'p50 ms':>8} {'p95 ms':>8} {'found':>6} {'err px':>8} {'p95 err':>8}")
+    print(f"{1.0:>6.2f} {np.median(ref_latency):>8.2f} {np.percentile(ref_latency, 95):>8.2f} "
+          f"{sum(r is not None for r in reference):>6} {0.0:>8.2f} {0.0:>8.2f}")
+
+    for scale in args.scales:
+        landmarks, latency = run(frames, scale)
+        # Mean per-landmark distance to the full-resolution result, on frames both found a hand
+        errors = [np.linalg.norm(lm - ref, axis=1).mean()
+                  for lm, ref in zip(landmarks, reference) if lm is not None and ref is not None]
+        err = np.mean(errors) if errors else float("nan")
+        err95 = np.percentile(errors, 95) if errors else float("nan")
+        print(f"{scale:>6.2f} {np.median(latency):>8.2f} {np.percentile(latency, 95):>8.2f} "
+              f"{sum(lm is not None for lm in landmarks):>6} {err:>8.2f} {err95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
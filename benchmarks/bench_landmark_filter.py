@@ -0,0 +1,129 @@
+# Landmark smoothing against detector jitter. Replays landmark traces with
+# seeded Gaussian noise added to every landmark, through the full pipeline of
+# a style, once per filter (none, One Euro, Kalman), and compares the keys
+# typed with those of the clean trace without a filter:
+#
+#   missed   keys of the clean run that were not typed
+#   false    keys typed that the clean run did not type
+#   delay    how much later than in the clean run the matched keys came
+#   resets   pinches over a key that broke before their hold was up
+#
+#   python benchmarks/bench_landmark_filter.py session.jsonl --jitter 2 --seeds 5
+#
+# Without recorded sessions, make_pinch_trace.py writes synthetic ones:
+#
+#   for s in 1 2 3; do python benchmarks/make_pinch_trace.py pinch$s.jsonl --seed $s --keys 15; done
+#   python benchmarks/bench_landmark_filter.py pinch1.jsonl pinch2.jsonl pinch3.jsonl --jitter 2
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from virtual_keyboard import STAGES, STYLES, build
+from virtual_keyboard.gesture_engine import ARMING, COMMITTED, HOVERING, GestureEngine
+from virtual_keyboard.headless import ManualClock, NullDisplay, TraceReplay
+from virtual_keyboard.key_output import NullOutput
+from virtual_keyboard.landmark_filter import FILTERS
+from virtual_keyboard.perf_stats import StageTimer
+
+MATCH_WINDOW = 0.5  # Seconds a key may come late and still count as the same keystroke
+
+
+# Gesture engine that notes every commit and every pinch broken mid-hold
+class RecordingEngine(GestureEngine):
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        self.commits = []  # (frame time, key index)
+        self.resets = 0
+
+    def step(self, state, now, key, pinching):
+        new = super().step(state, now, key, pinching)
+        if new.phase is COMMITTED:
+            self.commits.append((now, key))
+        elif state.phase is ARMING and new.phase is HOVERING:
+            self.resets += 1
+        return new
+
+
+# Trace replay with noise on the x and y of every landmark
+class JitteredReplay(TraceReplay):
+    def __init__(self, path, clock, sigma, seed):
+        super().__init__(path, clock)
+        self.sigma = sigma
+        self.rng = np.random.default_rng(seed)
+
+    def findHands(self, img, draw=False):
+        hands, img = super().findHands(img, draw)
+        if not self.sigma:
+            return hands, img
+        jittered = []
+        for hand in hands:
+            lm = np.array(hand["lmList"], np.float64)
+            lm[:, :2] += self.rng.normal(0.0, self.sigma, (len(lm), 2))
+            jittered.append(dict(hand, lmList=np.rint(lm).astype(np.int32).tolist()))
+        return jittered, img
+
+
+def replay(style, path, landmark_filter, sigma, seed, pinch_mode="hold"):
+    clock = ManualClock()
+    trace = JitteredReplay(path, clock, sigma, seed)
+    engine = RecordingEngine(hold_ms=0) if pinch_mode == "tap" else RecordingEngine()
+    keyboard = build(style, cap=trace, detector=trace, output=NullOutput(), display=NullDisplay(), clock=clock,
+                     perf=StageTimer(STAGES, enabled=False), engine=engine, budget=None, latency_export=None,
+                     perf_dump=None, startup_export=None, landmark_filter=landmark_filter, pinch_mode=pinch_mode)
+    while keyboard.step() is not None:
+        pass
+    keyboard.output.close()
+    return engine.commits, engine.resets
+
+
+# Pairs each reference keystroke with the first keystroke of the same key
+# within MATCH_WINDOW either side; returns (delays, missed, false)
+def match(reference, commits):
+    unmatched = list(commits)
+    delays = []
+    missed = 0
+    for t, key in reference:
+        for i, (u, other) in enumerate(unmatched):
+            if other == key and abs(u - t) <= MATCH_WINDOW:
+                delays.append(u - t)
+                del unmatched[i]
+                break
+        else:
+            missed += 1
+    return delays, missed, len(unmatched)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keystroke accuracy and latency with landmark smoothing")
+    parser.add_argument("traces", nargs="+", help="Landmark traces to replay")
+    parser.add_argument("--style", choices=list(STYLES), default="classic")
+    parser.add_argument("--jitter", type=float, default=2.0, help="Landmark noise, standard deviation in pixels")
+    parser.add_argument("--seeds", type=int, default=5, help="Noise seeds per trace")
+    args = parser.parse_args()
+
+    references = {path: replay(args.style, path, None, 0.0, 0)[0] for path in args.traces}
+    keys = sum(len(reference) for reference in references.values())
+    print(f"{keys} keys in the clean replays, jitter {args.jitter:.1f} px, {args.seeds} seeds per trace")
+    print(f"{'filter':<9} {'missed':>7} {'false':>7} {'delay mean':>11} {'delay p95':>10} {'resets':>7}")
+    for landmark_filter in [None] + list(FILTERS):
+        delays, missed, false, resets = [], 0, 0, 0
+        for path, reference in references.items():
+            for seed in range(args.seeds):
+                commits, broken = replay(args.style, path, landmark_filter, args.jitter, seed)
+                d, m, f = match(reference, commits)
+                delays += d
+                missed += m
+                false += f
+                resets += broken
+        runs = len(references) * args.seeds
+        delay = np.array(delays) * 1000 if delays else np.zeros(1)
+        print(f"{landmark_filter or 'none':<9} {missed / runs:>7.2f} {false / runs:>7.2f} "
+              f"{delay.mean():>8.1f} ms {np.percentile(delay, 95):>7.1f} ms {resets / runs:>7.2f}")
+    print("(missed, false and resets are per replay)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Hold versus tap pinch mode on recorded landmark traces. Replays every trace
+# through the full pipeline of a style in both modes, with and without added
+# landmark jitter, and reports:
+#
+#   keys     keys typed per replay
+#   latency  from the fingers closing (the thumb-index distance, measured
+#            relative to the hand's size like PinchGesture does, first
+#            dropping under PINCH_THRESHOLD) to the key being typed; a tap
+#            can fire just before, which makes it negative
+#   missed   keys the clean hold-mode replay typed that this one did not
+#   false    keys typed that the clean hold-mode replay did not
+#
+#   python benchmarks/bench_pinch_mode.py session.jsonl --jitter 2 --seeds 5
+#
+# Synthetic traces from make_pinch_trace.py, with quick closes and with slow
+# ones (which tap mode should not type):
+#
+#   python benchmarks/make_pinch_trace.py pinch1.jsonl --seed 1 --keys 15
+#   python benchmarks/make_pinch_trace.py slow1.jsonl --seed 1 --keys 15 --close-frames 30
+import argparse
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bench_landmark_filter import MATCH_WINDOW, match, replay
+from virtual_keyboard import STYLES
+from virtual_keyboard.config import LANDMARK_FILTER, PINCH_THRESHOLD
+from virtual_keyboard.gesture import PinchGesture
+from virtual_keyboard.headless import ManualClock, TraceReplay
+
+
+# Times the unfiltered thumb-index distance dropped under PINCH_THRESHOLD
+def closures(path):
+    clock = ManualClock()
+    trace = TraceReplay(path, clock)
+    gesture = PinchGesture(mode="hold")
+    times = []
+    was_open = True
+    while True:
+        success, img = trace.read()
+        if not success:
+            return times
+        hands, _ = trace.findHands(img)
+        gesture.update(hands, trace.last_timestamp)
+        if not gesture.measured:
+            continue
+        closed = gesture.euclidean_distance < PINCH_THRESHOLD
+        if closed and was_open:
+            times.append(trace.last_timestamp)
+        was_open = not closed
+
+
+# Seconds from the nearest closure to each commit
+def latencies(commits, closed_at):
+    result = []
+    for t, _ in commits:
+        nearest = min(closed_at, key=lambda c: abs(t - c), default=None)
+        if nearest is not None and abs(t - nearest) <= MATCH_WINDOW:
+            result.append(t - nearest)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keystroke latency and false positives of the pinch modes")
+    parser.add_argument("traces", nargs="+", help="Landmark traces to replay")
+    parser.add_argument("--style", choices=list(STYLES), default="classic")
+    parser.add_argument("--jitter", type=float, default=2.0, help="Landmark noise, standard deviation in pixels")
+    parser.add_argument("--seeds", type=int, default=5, help="Noise seeds per trace")
+    args = parser.parse_args()
+
+    references = {path: replay(args.style, path, LANDMARK_FILTER, 0.0, 0)[0] for path in args.traces}
+    closed_at = {path: closures(path) for path in args.traces}
+    keys = sum(len(reference) for reference in references.values())
+    print(f"{keys} keys in the clean hold-mode replays, filter {LANDMARK_FILTER or 'none'}")
+    print(f"{'mode':<5} {'jitter':>6} {'keys':>6} {'latency mean':>13} {'p95':>9} {'missed':>7} {'false':>7}")
+    for mode in ("hold", "tap"):
+        for sigma, seeds in ((0.0, 1), (args.jitter, args.seeds)):
+            typed, missed, false, delays = 0, 0, 0, []
+            for path, reference in references.items():
+                for seed in range(seeds):
+                    commits = replay(args.style, path, LANDMARK_FILTER, sigma, seed, pinch_mode=mode)[0]
+                    _, m, f = match(reference, commits)
+                    typed += len(commits)
+                    missed += m
+                    false += f
+                    delays += latencies(commits, closed_at[path])
+            runs = len(references) * seeds
+            delay = np.array(delays) * 1000 if delays else np.zeros(1)
+            print(f"{mode:<5} {sigma:>3.1f} px {typed / runs:>6.1f} {delay.mean():>10.1f} ms "
+                  f"{np.percentile(delay, 95):>6.1f} ms {missed / runs:>7.2f} {false / runs:>7.2f}")
+    print("(keys, missed and false are per replay)")
+
+
+if __name__ == "__main__":
+    main()
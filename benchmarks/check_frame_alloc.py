@@ -0,0 +1,76 @@
+# Steady-state allocation check for the frame loop. Runs a keyboard style
+# headless from a landmark trace (or a video) under tracemalloc and measures,
+# for every frame, how far traced memory rose above where the frame started -
+# numpy arrays and OpenCV outputs are both traced. After the warm-up frames
+# no frame may exceed --limit bytes; a per-frame image allocation such as an
+# unbuffered cv2.flip (2.7 MB at 1280x720) fails it straight away. What a
+# running frame still allocates is mostly sprites for text drawn for the first
+# time (tens of KiB), so the limit sits at about twice the worst such frame.
+#
+#   python benchmarks/check_frame_alloc.py modern --trace session.jsonl
+import argparse
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from virtual_keyboard import ALIASES, STYLES, build
+from virtual_keyboard.headless import ManualClock, NullDisplay, TraceReplay, VideoReplay, recording_output
+
+
+# Display that closes the books on a frame every time the loop polls for a key
+class AllocationDisplay(NullDisplay):
+    def __init__(self):
+        super().__init__()
+        self.peaks = []   # Bytes above the frame's starting point, per frame
+        self.start = None
+
+    def waitKey(self, delay=0):
+        current, peak = tracemalloc.get_traced_memory()
+        if self.start is not None:
+            self.peaks.append(peak - self.start)
+        tracemalloc.reset_peak()
+        self.start = current
+        return -1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the frame loop's steady-state allocation per frame")
+    parser.add_argument("style", choices=list(STYLES) + list(ALIASES))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="Recorded video, used in place of the camera")
+    source.add_argument("--trace", help="Landmark trace, used in place of camera and detector")
+    parser.add_argument("--warmup", type=int, default=30, help="Frames allowed to allocate buffers and caches")
+    parser.add_argument("--limit", type=int, default=128 * 1024, help="Bytes allowed per steady-state frame")
+    args = parser.parse_args()
+
+    clock = ManualClock()
+    detector = None
+    if args.trace:
+        cap = detector = TraceReplay(args.trace, clock)
+    else:
+        cap = VideoReplay(args.video, clock)
+    display = AllocationDisplay()
+    keyboard = build(args.style, cap=cap, detector=detector, output=recording_output(clock), display=display,
+                     clock=clock, budget=None, latency_export=None, perf_dump=None)
+
+    tracemalloc.start()
+    keyboard.run()
+    tracemalloc.stop()
+
+    steady = np.array(display.peaks[args.warmup:])
+    if len(steady) == 0:
+        sys.exit(f"Only {len(display.peaks)} frames, need more than the {args.warmup} warm-up frames")
+    worst = int(steady.argmax())
+    print(f"{len(steady)} steady-state frames: median {np.median(steady) / 1024:.1f} KiB, "
+          f"p99 {np.percentile(steady, 99) / 1024:.1f} KiB, "
+          f"max {steady[worst] / 1024:.1f} KiB (frame {worst + args.warmup})")
+    if steady[worst] > args.limit:
+        sys.exit(f"FAIL: frames allocate more than {args.limit / 1024:.0f} KiB")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
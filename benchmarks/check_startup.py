@@ -0,0 +1,69 @@
+# Startup time check. Launches the keyboard in a fresh interpreter several
+# times - so every run pays the real imports - with --startup, and reports the
+# median of each milestone: stages built, window shown, first camera frame,
+# first frame with the hand detector's output, all from the package import.
+# Fails if the median time to first frame is over --limit seconds.
+#
+#   python benchmarks/check_startup.py modern --trace session.jsonl
+#   python benchmarks/check_startup.py modern --video session.mp4 --runs 3
+#   python benchmarks/check_startup.py modern --live   # webcam and real model
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from virtual_keyboard import ALIASES, STYLES
+from virtual_keyboard.perf_stats import StartupTimer
+
+
+# One launch of the keyboard; returns its startup milestones
+def launch(style, source, path, timeout):
+    command = [sys.executable, "-m", "virtual_keyboard", style, "--output", "null", "--startup", path] + source
+    subprocess.run(command, cwd=ROOT, check=True, timeout=timeout, stdout=subprocess.DEVNULL)
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time to first frame and first detection")
+    parser.add_argument("style", choices=list(STYLES) + list(ALIASES))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="Recorded video, used in place of the camera")
+    source.add_argument("--trace", help="Landmark trace, used in place of camera and detector")
+    source.add_argument("--live", action="store_true", help="Webcam and window; quit each run with 'q'")
+    parser.add_argument("--runs", type=int, default=5, help="Launches to take the median over")
+    parser.add_argument("--limit", type=float, default=1.0, help="Seconds allowed to the first frame")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds before a run is abandoned")
+    args = parser.parse_args()
+
+    source = ["--video", args.video] if args.video else ["--trace", args.trace] if args.trace else []
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            runs.append(launch(args.style, source, os.path.join(tmp, f"startup{i}.json"), args.timeout))
+
+    first_frame = None
+    for event, label in StartupTimer.EVENTS.items():
+        times = [run[event] for run in runs if event in run]
+        if not times:
+            print(f"{label:<16} never")
+            continue
+        median = float(np.median(times))
+        if event == "first_frame":
+            first_frame = median
+        print(f"{label:<16} median {median:6.2f} s  min {min(times):6.2f} s  max {max(times):6.2f} s")
+    if first_frame is None:
+        sys.exit("FAIL: no frame was shown")
+    if first_frame > args.limit:
+        sys.exit(f"FAIL: first frame after {first_frame:.2f} s, more than {args.limit:.2f} s")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Compare keystroke latency exports (LATENCY_EXPORT / replay.py --latency)
+# from different builds: per-segment percentiles side by side and the
+# end-to-end histograms as text bars.
+#
+#   python benchmarks/compare_latency.py before.json after.json
+import argparse
+import json
+import os
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    data["name"] = data.get("label") or os.path.splitext(os.path.basename(path))[0]
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare keystroke latency exports between builds")
+    parser.add_argument("exports", nargs="+", help="JSON files written by LatencyTracker.export")
+    parser.add_argument("--width", type=int, default=40, help="Width of the histogram bars")
+    args = parser.parse_args()
+
+    runs = [load(path) for path in args.exports]
+    if any(run["bins_ms"] != runs[0]["bins_ms"] for run in runs):
+        sys.exit("Exports use different histogram bins")
+
+    names = [run["name"][:16] for run in runs]
+    print(f"{'segment':<8} {'':<4} " + " ".join(f"{name:>16}" for name in names))
+    for segment in ["hold", "loop", "output", "total"]:
+        for stat in ["p50_ms", "p95_ms", "p99_ms"]:
+            values = [run["summary"].get(segment, {}).get(stat) for run in runs]
+            cells = " ".join(f"{v:16.1f}" if v is not None else f"{'-':>16}" for v in values)
+            print(f"{segment:<8} {stat[:3]:<4} {cells}")
+
+    edges = runs[0]["bins_ms"]
+    peak = max(max(run["counts"]) for run in runs) or 1
+    for run in runs:
+        print(f"\n{run['name']} - {sum(run['counts'])} keystrokes, pinch onset to injection")
+        for lo, hi, count in zip(edges[:-1], edges[1:], run["counts"]):
+            if count:
+                print(f"  {lo:5.0f}-{hi:<5.0f} ms {count:5d} " + "#" * max(1, count * args.width // peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Synthetic landmark traces for the gesture benchmarks (bench_landmark_filter.py
+# and friends). A hand moves its index tip to a random letter, digit or
+# punctuation key of a style's layout, hovers, pinches, holds the pinch and
+# lets go, once per key. The pinch settles a few reference pixels inside
+# VERTICAL_THRESHOLD / PINCH_THRESHOLD, which is where detector jitter makes a
+# held pinch flicker open.
+#
+# Only the landmarks the pipeline reads are placed: index tip (8), thumb tip
+# (4) and base (2), and the wrist (0) and middle-finger knuckle (9) that give
+# the hand's size; the rest sit on the knuckle. --scale sets the size
+# relative to HAND_SCALE_REFERENCE (0.5 is a hand twice as far away).
+# --close-frames slows the closing of the pinch down; tap mode is meant to
+# ignore slow closes (bench_pinch_mode.py).
+#
+#   python benchmarks/make_pinch_trace.py pinch1.jsonl --seed 1 --keys 15
+#   python benchmarks/make_pinch_trace.py slow1.jsonl --seed 1 --keys 15 --close-frames 30
+#   python -m virtual_keyboard classic --trace pinch1.jsonl --output null
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from virtual_keyboard import STYLES
+from virtual_keyboard.config import HAND_SCALE_REFERENCE
+
+FPS = 30.0
+OPEN = (30.0, 80.0)   # Thumb tip from index tip, (x, y) reference pixels, fingers apart
+CLOSED_X = 20.0       # Horizontal gap of the closed pinch
+CLOSED_Y = (33, 37)   # Range the vertical gap of a closed pinch is drawn from
+
+
+class TraceWriter():
+    def __init__(self, f, scale):
+        self.f = f
+        self.scale = scale * HAND_SCALE_REFERENCE / 120  # Knuckle sits 120 px from the wrist at scale 1
+        self.t = 0.0
+
+    def frame(self, tip, gap):
+        s = self.scale
+        thumb = tip + np.array(gap) * s
+        points = {0: tip + np.array([0.0, 200.0]) * s,   # Wrist
+                  9: tip + np.array([0.0, 80.0]) * s,    # Middle-finger knuckle
+                  8: tip,
+                  4: thumb,
+                  2: thumb + np.array([-20.0, 60.0]) * s}  # Thumb base, below the raised tip
+        lmList = [[int(round(p[0])), int(round(p[1])), 0] for p in (points.get(i, points[9]) for i in range(21))]
+        x, y = int(tip[0]), int(tip[1])
+        hand = {"lmList": lmList, "bbox": [x - int(50 * s), y, int(100 * s), int(200 * s)],
+                "center": [x, y + int(100 * s)], "type": "Right"}
+        self.f.write(json.dumps({"t": self.t, "hands": [hand]}) + "\n")
+        self.t += 1 / FPS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic pinch-typing landmark trace")
+    parser.add_argument("out", help="JSON-lines trace to write")
+    parser.add_argument("--style", choices=sorted(STYLES), default="classic", help="Layout the keys are taken from")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keys", type=int, default=12, help="Keys to type")
+    parser.add_argument("--scale", type=float, default=1.0, help="Hand size relative to HAND_SCALE_REFERENCE")
+    parser.add_argument("--close-frames", type=int, default=4, help="Frames the fingers take to close")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    layout, _ = STYLES[args.style]
+    keys = [key for key in layout() if len(key.text) == 1 and key.text.isascii()]
+    tip = np.array([300.0, 400.0])
+    with open(args.out, "w") as f:
+        trace = TraceWriter(f, args.scale)
+        for _ in range(args.keys):
+            key = keys[rng.integers(len(keys))]
+            target = np.array([key.pos[0] + key.size[0] / 2, key.pos[1] + key.size[1] / 2])
+            start = tip
+            for k in range(1, 13):  # Move over 0.4 s, eased
+                tip = start + (target - start) * (0.5 - 0.5 * np.cos(np.pi * k / 12))
+                trace.frame(tip, OPEN)
+            for _ in range(6):      # Hover
+                trace.frame(tip, OPEN)
+            closed = (CLOSED_X, rng.uniform(*CLOSED_Y))
+            n = args.close_frames
+            for k in range(1, n + 1):  # Close the pinch
+                trace.frame(tip, np.add(OPEN, np.subtract(closed, OPEN) * k / n))
+            for _ in range(12):     # Hold 0.4 s
+                trace.frame(tip, closed)
+            for k in range(1, 5):   # Open
+                trace.frame(tip, np.add(closed, np.subtract(OPEN, closed) * k / 4))
+    print(f"{args.out}: {args.keys} keys, {trace.t:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# Headless replay: drives a keyboard style's full frame loop from a recorded
+# video or a landmark trace instead of the webcam, with no window and no real
+# key presses, on a clock that follows the recording. The same input gives the
+# same keystrokes every run, so it doubles as a regression check. Same as
+# `python -m virtual_keyboard` with --video or --trace.
+#
+#   python replay.py modern --video session.mp4 --out annotated.avi
+#   python replay.py classic --video session.mp4 --record-trace session.jsonl
+#   python replay.py classic --trace session.jsonl
+#   python replay.py classic --trace session.jsonl --record session.trace
+#   python replay.py classic --trace session.trace
+import sys
+
+from virtual_keyboard.cli import main as cli_main
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not any(arg.split("=")[0] in ("--video", "--trace") for arg in argv):
+        sys.exit("replay.py: one of --video or --trace is required")
+    return cli_main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
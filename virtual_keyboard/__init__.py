@@ -0,0 +1,14 @@
+# Hand-tracking virtual keyboard as a pipeline of swappable stages:
+# Capture -> Detect -> Gesture -> Layout/HitTest -> Render -> Output.
+# See stages.py for the stage interfaces and cli.py for the entry point.
+from time import perf_counter
+
+LAUNCHED = perf_counter()  # Startup is timed from here, before OpenCV and NumPy load
+
+from .cli import ALIASES, STYLES, build, main, run_style
+from .gesture import PinchGesture
+from .layout import LAYOUTS, Key, Keyboard, ergonomic_layout, straight_layout
+from .pipeline import STAGES, Pipeline
+from .render_camera import CameraRenderer, GradientRenderer
+from .render_modern import ModernRenderer
+from .stages import FrameState
@@ -0,0 +1,127 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+from .config import (CALIBRATION_SECONDS, GREEN, HAND_SCALE_REFERENCE, LIGHT_TEXT, PINCH_THRESHOLD,
+                     VERTICAL_THRESHOLD)
+from .gesture import PinchGesture
+
+# Per-user pinch calibration. The user holds the hand open for a couple of
+# seconds, then pinches for a couple more; the thumb-index distances of each
+# pose (in reference pixels, see gesture.py, so the profile holds at any
+# distance from the camera) give the user's own open and pinched distances,
+# and the pinch threshold goes PINCH_POINT of the way from pinched to open.
+# The clock of a step only runs while a hand is measured, and its first
+# SETTLE seconds are not sampled, while the hand gets into the pose.
+#
+# The profile is a small JSON file; PinchGesture.use_profile applies it.
+
+STEPS = (("open", "Hold your hand up with thumb and index finger apart"),
+         ("pinched", "Now pinch thumb and index finger together"))
+SETTLE = 0.5          # Seconds at the start of a step that are not sampled
+PINCH_POINT = 0.4     # Where between pinched (0) and open (1) the threshold goes
+MIN_SEPARATION = 15   # Reference pixels open and pinched must be apart
+MIN_SAMPLES = 5       # Samples a step needs
+
+
+class Calibrator():
+    def __init__(self, seconds=CALIBRATION_SECONDS):
+        self.seconds = seconds
+        self.gesture = PinchGesture(mode="hold")
+        self.samples = {name: [] for name, _ in STEPS}  # (vertical, euclidean) per frame
+        self.elapsed = 0.0   # Seconds of hand seen so far, over all steps
+        self.last_time = None
+
+    @property
+    def done(self):
+        return self.elapsed >= self.seconds * len(STEPS)
+
+    # Index of the current step and the fraction of it done
+    def progress(self):
+        step = min(int(self.elapsed // self.seconds), len(STEPS) - 1)
+        return step, min(self.elapsed / self.seconds - step, 1.0)
+
+    def add(self, hands, frame_time):
+        gesture = self.gesture
+        gesture.update(hands, frame_time)
+        last, self.last_time = self.last_time, frame_time
+        if not gesture.measured or last is None or self.done:
+            return
+        step, _ = self.progress()
+        self.elapsed += frame_time - last
+        if self.elapsed - step * self.seconds >= SETTLE:
+            self.samples[STEPS[step][0]].append((gesture.vertical_distance, gesture.euclidean_distance))
+
+    # The profile from the samples; ValueError when they don't make one
+    def profile(self):
+        medians = {}
+        for name, _ in STEPS:
+            samples = self.samples[name]
+            if len(samples) < MIN_SAMPLES:
+                raise ValueError(f"Calibration: not enough frames of the {name} hand ({len(samples)})")
+            medians[name] = np.median(np.array(samples), axis=0)
+        open_distance = float(medians["open"][1])
+        pinched_distance = float(medians["pinched"][1])
+        if open_distance - pinched_distance < MIN_SEPARATION:
+            raise ValueError(f"Calibration: open ({open_distance:.0f}) and pinched ({pinched_distance:.0f}) "
+                             "distances are too close together")
+        pinch_threshold = pinched_distance + PINCH_POINT * (open_distance - pinched_distance)
+        return {"hand_scale_reference": HAND_SCALE_REFERENCE,
+                "open_distance": open_distance,
+                "pinched_distance": pinched_distance,
+                "pinched_vertical": float(medians["pinched"][0]),
+                "pinch_threshold": pinch_threshold,
+                # The vertical limit keeps its default ratio to the distance limit
+                "vertical_threshold": pinch_threshold * VERTICAL_THRESHOLD / PINCH_THRESHOLD,
+                "samples": {name: len(self.samples[name]) for name, _ in STEPS}}
+
+    # Instruction and progress bar over the camera frame
+    def draw(self, img):
+        step, fraction = self.progress()
+        text = STEPS[step][1] if self.gesture.measured else "Show your hand to the camera"
+        cv2.putText(img, f"Calibration {step + 1}/{len(STEPS)}: {text}", (50, 60),
+                    cv2.FONT_HERSHEY_PLAIN, 2, LIGHT_TEXT, 2)
+        x0, y0, width = 50, 80, 600
+        cv2.rectangle(img, (x0, y0), (x0 + width, y0 + 16), LIGHT_TEXT, 2)
+        cv2.rectangle(img, (x0, y0), (x0 + int(width * fraction), y0 + 16), GREEN, cv2.FILLED)
+
+
+def save_profile(profile, path):
+    with open(os.path.expanduser(path), "w") as f:
+        json.dump(profile, f, indent=2)
+
+
+# The profile saved at path, None if there is none
+def load_profile(path):
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# Runs the calibration steps on a keyboard's camera and detector before it
+# starts typing. Returns the profile, or None when 'q' is pressed or the
+# capture runs out first
+def calibrate(pipeline, seconds=CALIBRATION_SECONDS):
+    calibrator = Calibrator(seconds)
+    while not calibrator.done:
+        success, img = pipeline.capture.read()
+        if not success:
+            if getattr(pipeline.capture, "finished", False):
+                return None
+            pipeline.display.waitKey(10)  # Camera still opening
+            continue
+        frame_time = getattr(pipeline.capture, "last_timestamp", pipeline.clock())
+        img = pipeline.arena.flip(img, 1)
+        hands, img = pipeline.detector.findHands(img, draw=True)
+        if pipeline.smoother is not None:
+            hands = pipeline.smoother.update(hands, frame_time)
+        calibrator.add(hands, frame_time)
+        calibrator.draw(img)
+        pipeline.display.imshow(pipeline.renderer.title, img)
+        if pipeline.display.waitKey(1) & 0xFF == ord('q'):
+            return None
+    return calibrator.profile()
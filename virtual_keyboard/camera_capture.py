@@ -0,0 +1,190 @@
+import threading
+from collections import namedtuple
+from time import perf_counter, sleep, time
+
+import cv2
+
+# A captured frame: the image, the clock time it was grabbed and its sequence number
+Frame = namedtuple("Frame", ["image", "timestamp", "seq"])
+
+
+# Runs cv2.VideoCapture on its own thread so the frame loop never blocks on the
+# driver. Frames land in a small ring of preallocated slots and readers always
+# get the newest one ("latest frame wins"); frames that were overwritten before
+# anyone read them are counted as dropped, frames handed out twice as duplicated.
+#
+# Works the same with a video file as the source. Files are paced at their own
+# frame rate by default so they behave like a live camera; lockstep=True instead
+# waits for every frame to be read before grabbing the next (no drops), which is
+# what tests and replays want.
+#
+# Opening a camera can take a second or more, so the device is opened on the
+# capture thread too: the constructor returns at once and read() reports no
+# frame, without waiting, until the first one arrives. A device that fails to
+# open finishes the capture with error set.
+class ThreadedCapture():
+    def __init__(self, source=0, width=None, height=None, slots=3,
+                 realtime=None, lockstep=False, clock=time):
+        self.source = source
+        self.size = (width, height)
+        self.cap = None
+        self.opened = threading.Event()  # Set once the device is open (or failed to open)
+
+        self.is_file = isinstance(source, str)
+        self.realtime = self.is_file if realtime is None else realtime
+        self.lockstep = lockstep
+        self.clock = clock
+        self.opened_at = None  # perf_counter time the device was open, for the startup timings
+        self.error = None      # Why the device could not be opened
+
+        # Ring buffer - a slot is never written while it is the latest frame or
+        # while a reader is still holding it, so three slots are always enough
+        self.slots = [None] * max(slots, 3)
+        self.stamps = [0.0] * len(self.slots)
+        self.seqs = [0] * len(self.slots)
+        self.latest = -1
+        self.leased = -1
+
+        self.cond = threading.Condition()
+        self.seq = 0              # Sequence number of the newest frame
+        self.last_read_seq = 0    # Sequence number last handed to a reader
+        self.last_timestamp = 0.0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
+        self.read_failures = 0
+        self.finished = False
+        self.running = True
+
+        self.thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self.thread.start()
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.source)
+        width, height = self.size
+        if width:
+            self.cap.set(3, width)
+        if height:
+            self.cap.set(4, height)
+        self.source_fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.opened_at = perf_counter()
+        self.opened.set()
+        return self.cap.isOpened()
+
+    def _free_slot(self):
+        for i in range(len(self.slots)):
+            if i != self.latest and i != self.leased:
+                return i
+
+    def _run(self):
+        if not self._open():
+            self.error = f"Failed to open camera {self.source!r}"
+            self.running = False
+        next_time = self.clock()
+        while self.running:
+            with self.cond:
+                if self.lockstep:
+                    self.cond.wait_for(lambda: self.seq == self.last_read_seq or not self.running)
+                    if not self.running:
+                        break
+                slot = self._free_slot()
+
+            # Reuses the slot's buffer when the frame size matches
+            if self.slots[slot] is None:
+                success, img = self.cap.read()
+            else:
+                success, img = self.cap.read(self.slots[slot])
+            timestamp = self.clock()
+
+            if not success:
+                if self.is_file:
+                    break
+                self.read_failures += 1
+                sleep(0.005)
+                continue
+
+            with self.cond:
+                if self.latest >= 0 and self.seqs[self.latest] > self.last_read_seq:
+                    self.frames_dropped += 1
+                self.seq += 1
+                self.slots[slot] = img
+                self.stamps[slot] = timestamp
+                self.seqs[slot] = self.seq
+                self.latest = slot
+                self.frames_captured += 1
+                self.cond.notify_all()
+
+            if self.realtime:
+                next_time += 1.0 / self.source_fps
+                delay = next_time - self.clock()
+                if delay > 0:
+                    sleep(delay)
+                else:
+                    next_time = self.clock()
+
+        with self.cond:
+            self.finished = True
+            self.cond.notify_all()
+
+    # Newest frame as a Frame, waiting up to timeout for one newer than the last
+    # read. Returns None once the source is exhausted, and at once while no
+    # frame has been captured yet. The image stays valid until the next call.
+    def read_frame(self, timeout=1.0):
+        with self.cond:
+            if self.latest < 0:
+                timeout = 0  # Still opening: the caller keeps its window going meanwhile
+            self.cond.wait_for(lambda: self.seq > self.last_read_seq or self.finished, timeout)
+            if self.latest < 0:
+                return None
+            slot = self.latest
+            if self.seqs[slot] == self.last_read_seq:
+                if self.finished:
+                    return None
+                self.frames_duplicated += 1
+            self.last_read_seq = self.seqs[slot]
+            self.leased = slot
+            self.last_timestamp = self.stamps[slot]
+            self.cond.notify_all()
+            return Frame(self.slots[slot], self.stamps[slot], self.seqs[slot])
+
+    # Same interface as cv2.VideoCapture.read(); the capture time of the
+    # returned frame is available as last_timestamp
+    def read(self):
+        frame = self.read_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    # Frame rate of the source, once it is open
+    @property
+    def fps(self):
+        self.opened.wait()
+        return self.source_fps
+
+    def isOpened(self):
+        self.opened.wait()
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        self.opened.wait()
+        return self.cap.get(prop)
+
+    def stats(self):
+        return {"captured": self.frames_captured,
+                "dropped": self.frames_dropped,
+                "duplicated": self.frames_duplicated,
+                "read_failures": self.read_failures}
+
+    def report(self):
+        s = self.stats()
+        return [f"Capture: {s['captured']} frames, {s['dropped']} dropped unread, "
+                f"{s['duplicated']} read twice, {s['read_failures']} read failures"]
+
+    def release(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread.is_alive():
+            self.thread.join()
+        if self.cap is not None:
+            self.cap.release()
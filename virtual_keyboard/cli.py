@@ -0,0 +1,220 @@
+# Command line entry point for every style of the keyboard.
+#
+#   python -m virtual_keyboard                      # modern style, webcam
+#   python -m virtual_keyboard classic --capture direct
+#   python -m virtual_keyboard modern --video session.mp4 --out annotated.avi
+#   python -m virtual_keyboard classic --video session.mp4 --record-trace session.jsonl
+#   python -m virtual_keyboard classic --trace session.jsonl --record session.trace
+#   python -m virtual_keyboard gradient --trace session.trace --output null
+#   python -m virtual_keyboard modern --startup startup.json
+#   python -m virtual_keyboard modern --calibrate
+#
+# With --video or --trace the keyboard runs headless: no window and no real
+# key presses, on a clock that follows the recording. The same input gives the
+# same keystrokes every run, so it doubles as a regression check.
+import argparse
+import sys
+from functools import partial
+from time import perf_counter, time
+
+import cv2
+
+from .calibration import calibrate, load_profile, save_profile
+from .camera_capture import ThreadedCapture
+from .config import (DETECTOR_BACKGROUND_LOAD, DETECTOR_BUDGET, DETECTOR_PROCESS, DRAW_LANDMARKS, FRAME_SIZE,
+                     LANDMARK_FILTER, LATENCY_EXPORT, PERF_DUMP, PERF_DUMP_INTERVAL, PERF_STATS, PINCH_MODE,
+                     PREDICT_TIP, PREDICTION_LOOKAHEAD_MS, PROFILE_PATH, RECORD_LANDMARKS, STARTUP_EXPORT)
+from .gesture import PinchGesture
+from .gesture_engine import GestureEngine
+from .hand_tracking import BackgroundHandDetector, create_detector
+from .headless import (ManualClock, NullDisplay, TraceRecorder, TraceReplay, VideoFileDisplay,
+                       VideoReplay, recording_output)
+from .key_output import KeyInjector, NullOutput
+from .landmark_filter import FILTERS, create_smoother
+from .landmark_trace import LandmarkTraceWriter
+from .layout import Keyboard, ergonomic_layout, straight_layout
+from .perf_stats import StageTimer
+from .prediction import TipPredictor
+from .pipeline import STAGES, Pipeline
+from .render_camera import CameraRenderer, GradientRenderer
+from .render_modern import ModernRenderer
+from .text_buffer import TextBuffer
+
+# Visual styles as (layout, renderer)
+STYLES = {
+    "classic": (straight_layout, CameraRenderer),    # main.py
+    "gradient": (straight_layout, GradientRenderer),  # fixed_main.py
+    "modern": (ergonomic_layout, ModernRenderer),    # modernKeyboard.py
+}
+# The scripts each style started out as
+ALIASES = {"main": "classic", "fixed_main": "gradient", "modernKeyboard": "modern"}
+
+
+# Assemble a keyboard of the given style. Every stage left as None gets the
+# live default: the webcam, the usual detector chain, real key presses
+def build(style="modern", cap=None, detector=None, output=None, display=cv2, clock=time, recorder=None,
+          perf=None, latency=None, gesture=None, engine=None, budget=DETECTOR_BUDGET,
+          detector_process=DETECTOR_PROCESS, lockstep=False, latency_export=LATENCY_EXPORT, perf_dump=PERF_DUMP,
+          startup_export=STARTUP_EXPORT,
+          landmark_filter=LANDMARK_FILTER, pinch_mode=PINCH_MODE, predict=PREDICT_TIP,
+          lookahead_ms=PREDICTION_LOOKAHEAD_MS, profile=None):
+    layout, Renderer = STYLES[ALIASES.get(style, style)]
+    keys = layout()
+    text = TextBuffer()  # Typed text
+    renderer = Renderer(keys, text)
+    if cap is None:
+        # Camera Setup - frames are grabbed on a background thread, the loop always gets the newest one
+        cap = ThreadedCapture(0, width=FRAME_SIZE[0], height=FRAME_SIZE[1], clock=clock)
+    if detector is None and detector_process:
+        from .detector_process import ProcessHandDetector
+
+        # Detection no longer holds up the frame loop, so the worker detects
+        # every frame it gets instead of keeping to a time budget
+        factory = partial(create_detector, display=renderer.detector_display, budget=None)
+        detector = ProcessHandDetector(factory, lockstep=lockstep)
+    elif detector is None and DETECTOR_BACKGROUND_LOAD:
+        # The model loads while the camera opens and the window comes up;
+        # a replay waits for it so every frame is detected
+        factory = partial(create_detector, display=renderer.detector_display, budget=budget)
+        detector = BackgroundHandDetector(factory, wait=lockstep)
+    elif detector is None:
+        detector = create_detector(display=renderer.detector_display, budget=budget)
+    if output is None:
+        from pynput.keyboard import Controller
+        output = KeyInjector(Controller())  # Presses keys off the frame loop
+    if recorder is None and RECORD_LANDMARKS:
+        recorder = LandmarkTraceWriter(RECORD_LANDMARKS)
+    if perf is None:
+        perf = StageTimer(STAGES, enabled=PERF_STATS, dump_path=perf_dump, dump_interval=PERF_DUMP_INTERVAL)
+    if gesture is None:
+        gesture = PinchGesture(mode=pinch_mode)
+    if profile is not None:
+        gesture.use_profile(profile)  # Calibrated thresholds
+    if engine is None and pinch_mode == "tap":
+        engine = GestureEngine(hold_ms=0)  # The tap itself is the commit
+    predictor = None
+    if predict:
+        predictor = TipPredictor(lookahead=None if lookahead_ms is None else lookahead_ms / 1000)
+    return Pipeline(cap, detector, gesture, Keyboard(keys), renderer, output, text, display=display,
+                    clock=clock, recorder=recorder, perf=perf, latency=latency,
+                    draw_landmarks=DRAW_LANDMARKS, latency_export=latency_export,
+                    startup_export=startup_export, engine=engine, smoother=create_smoother(landmark_filter),
+                    predictor=predictor)
+
+
+# Run a keyboard of the given style until 'q' or the end of the input and
+# return the typed text
+def run_style(style="modern", **stages):
+    return build(style, **stages).run()
+
+
+def main(argv=None, default_style="modern"):
+    parser = argparse.ArgumentParser(prog="virtual_keyboard",
+                                     description="Hand-tracking virtual keyboard")
+    parser.add_argument("style", nargs="?", default=default_style, choices=list(STYLES) + list(ALIASES),
+                        help=f"Visual style (default: {default_style})")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", help="Recorded video, used in place of the camera (runs headless)")
+    source.add_argument("--trace", help="Landmark trace (JSON lines or binary trace directory), "
+                                        "used in place of camera and detector (runs headless)")
+    parser.add_argument("--fps", type=float, help="Frame rate of the video (default: from the file)")
+    parser.add_argument("--cadence", action="store_true",
+                        help="Keep the adaptive detector cadence on a video (timing dependent, so not repeatable)")
+    parser.add_argument("--detector-process", action="store_true", default=DETECTOR_PROCESS,
+                        help="Run the hand detector in a worker process (in lockstep with a video, so repeatable)")
+    parser.add_argument("--pinch", choices=["hold", "tap"], default=PINCH_MODE,
+                        help="Type on a held pinch or on a quick tap of thumb and index finger")
+    parser.add_argument("--predict", action="store_true", default=PREDICT_TIP,
+                        help="Hit-test where the index tip is predicted to be by now")
+    parser.add_argument("--lookahead", type=float, default=PREDICTION_LOOKAHEAD_MS, metavar="MS",
+                        help="Milliseconds to predict ahead (default: the measured delay, zero on a replay)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Learn your open and pinched hand first and save them to the profile")
+    parser.add_argument("--profile", help=f"Calibration profile (default: {PROFILE_PATH}, not used headless)")
+    parser.add_argument("--filter", choices=list(FILTERS) + ["none"], default=LANDMARK_FILTER or "none",
+                        help="Landmark smoothing before pinch detection")
+    parser.add_argument("--capture", choices=["threaded", "direct"], default="threaded",
+                        help="Read the webcam on a background thread or straight from the frame loop")
+    parser.add_argument("--output", choices=["keys", "null"],
+                        help="Press real keys or drop them (default: keys live, recorded keys headless)")
+    parser.add_argument("--out", help="Write the rendered frames to this video file")
+    parser.add_argument("--record-trace", help="Write the detector output to this landmark trace")
+    parser.add_argument("--record", help="Write a binary landmark trace with pinch/hover state to this directory")
+    parser.add_argument("--perf", help="Write the per-stage frame timings to this .csv or .json file")
+    parser.add_argument("--latency", help="Write the keystroke latency histogram to this .json file")
+    parser.add_argument("--startup", help="Write the startup milestones (time to first frame etc.) to this .json file")
+    args = parser.parse_args(argv)
+    if args.lookahead is not None and args.lookahead < 0:
+        parser.error("--lookahead must not be negative")
+
+    headless = bool(args.video or args.trace)
+    clock = ManualClock() if headless else time
+    budget = DETECTOR_BUDGET
+    detector = None
+    if args.trace:
+        cap = detector = TraceReplay(args.trace, clock)
+    elif args.video:
+        cap = VideoReplay(args.video, clock, args.fps)
+        if not args.cadence:
+            # The cadence adapts to measured wall-clock cost; detect every frame instead
+            budget = None
+    elif args.capture == "direct":
+        cap = cv2.VideoCapture(0)
+        cap.set(3, FRAME_SIZE[0])
+        cap.set(4, FRAME_SIZE[1])
+    else:
+        cap = ThreadedCapture(0, width=FRAME_SIZE[0], height=FRAME_SIZE[1], clock=clock)
+
+    if args.out:
+        display = VideoFileDisplay(args.out, getattr(cap, "fps", 30.0))
+    else:
+        display = NullDisplay() if headless else cv2
+    if args.output == "null":
+        output = NullOutput()
+    elif headless and args.output is None:
+        output = recording_output(clock)
+    else:
+        output = None
+    recorder = LandmarkTraceWriter(args.record) if args.record else None
+    # A replay only uses a profile it is given, so it types the same on any machine
+    profile_path = args.profile or PROFILE_PATH
+    profile = load_profile(profile_path) if args.profile or not headless else None
+
+    keyboard = build(args.style, cap=cap, detector=detector, output=output, display=display, clock=clock,
+                     recorder=recorder, budget=budget, detector_process=args.detector_process,
+                     lockstep=headless, latency_export=args.latency or LATENCY_EXPORT,
+                     perf_dump=args.perf or PERF_DUMP, startup_export=args.startup or STARTUP_EXPORT,
+                     landmark_filter=None if args.filter == "none" else args.filter, pinch_mode=args.pinch,
+                     predict=args.predict, lookahead_ms=args.lookahead, profile=profile)
+    if args.record_trace:
+        keyboard.detector = TraceRecorder(keyboard.detector, args.record_trace, clock)
+
+    if args.calibrate:
+        try:
+            profile = calibrate(keyboard)
+        except ValueError as e:
+            print(f"{e}; keeping the current thresholds")
+            profile = None
+        if profile is not None:
+            save_profile(profile, profile_path)
+            keyboard.gesture.use_profile(profile)
+            print(f"Calibrated: open {profile['open_distance']:.0f}, pinched {profile['pinched_distance']:.0f}, "
+                  f"pinch threshold {profile['pinch_threshold']:.0f} (saved to {profile_path})")
+
+    start = perf_counter()
+    text = keyboard.run()
+    elapsed = perf_counter() - start
+
+    if headless:
+        frames = display.frames
+        print(f"Frames: {frames} in {elapsed:.2f} s ({frames / max(elapsed, 1e-9):.1f} FPS)")
+        events = getattr(getattr(keyboard.output, "keyboard", None), "events", None)
+        if events is not None:
+            print(f"Keys: {len(events)} events")
+            for t, action, key in events:
+                print(f"  {t:8.3f}  {action:<7} {key!r}")
+    print(f"Text: {text!r}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
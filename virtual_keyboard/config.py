@@ -0,0 +1,78 @@
+# Settings shared by every style of the keyboard. The command line overrides
+# the ones it has options for (see cli.py); the rest are edited here.
+
+FRAME_SIZE = (1280, 720)      # Camera and window resolution
+
+# Hand Detector - increased confidence for better detection. It runs on a
+# downscaled copy of the frame and landmarks come back in screen coordinates
+INFERENCE_SIZE = (640, 360)   # Resolution the hand detector runs at
+TRACK_HAND_ROI = True         # Search only around the last known hand once one is found
+DETECTOR_BUDGET = 0.015       # Seconds of detection per frame; landmarks are tracked with
+                              # optical flow on the frames in between (None = detect every frame)
+DETECTOR_PROCESS = False      # Run the detector in a worker process, frames handed over in shared memory
+DETECTOR_BACKGROUND_LOAD = True  # Load and warm up the model on a thread while the camera opens
+DRAW_LANDMARKS = False        # Draw the detected hand landmarks on the frame
+
+RECORD_LANDMARKS = None       # Directory to record a landmark trace of the session to (None = off)
+PERF_STATS = True             # Time every stage of the frame loop; 'p' toggles the overlay
+PERF_DUMP = None              # .csv or .json file the stage timings are written to (None = off)
+PERF_DUMP_INTERVAL = 10.0     # Seconds between timing dumps
+LATENCY_EXPORT = None         # JSON file the keystroke latency histogram is written to on exit (None = off)
+STARTUP_EXPORT = None         # JSON file the startup milestones are written to on exit (None = off)
+
+# Color definitions - Modern color palette
+DARK_BG = (40, 44, 52)      # Dark background
+KEY_DARK = (59, 66, 82)     # Dark key color
+KEY_LIGHT = (97, 110, 136)  # Light key color (hover)
+KEY_PRESS = (66, 99, 235)   # Pressed key - vibrant blue
+KEY_BORDER = (75, 85, 99)   # Key border
+
+# Text colors
+WHITE = (255, 255, 255)     # White text
+BRIGHT_TEXT = (224, 240, 255)  # Bright text
+LIGHT_TEXT = (187, 198, 209)   # Light gray text
+
+# Status colors
+GREEN = (0, 230, 118)       # Success green
+RED = (66, 66, 230)         # Alert red (in BGR)
+YELLOW = (20, 195, 235)     # Warning yellow (in BGR)
+ACCENT = (232, 150, 77)     # Accent color - orange/teal
+
+# Pinch detection parameters - stricter requirements. Distances are in pixels
+# for a hand of HAND_SCALE_REFERENCE; every frame they are rescaled by the
+# hand's measured size, so the pinch works the same near and far from the
+# camera and in the modern style's scaled-down preview coordinates
+HAND_SCALE_REFERENCE = 120  # Wrist to middle-finger knuckle distance, in pixels, the thresholds are set for
+VERTICAL_THRESHOLD = 40     # Maximum vertical distance for pinch detection
+PINCH_THRESHOLD = 45        # Maximum Euclidean distance for pinch detection
+THUMB_RAISE = 30            # How far the thumb tip must be above its base
+PROFILE_PATH = "~/.virtual_keyboard_profile.json"  # Calibrated thresholds (--calibrate), loaded when present
+CALIBRATION_SECONDS = 2.0   # Seconds of hand seen per calibration step
+HOLD_TIME_MS = 130          # Milliseconds a pinch must be held before registering (5 frames at 30 FPS)
+PINCH_MODE = "hold"         # "hold": pinch and hold for HOLD_TIME_MS; "tap": type on a quick closing tap
+
+# Tap mode - see TapDetector in gesture_engine.py. Distances in reference pixels, as above
+TAP_SPEED = 150             # Pixels/s the thumb-index distance must be closing at
+TAP_DEPTH = 25              # Pixels it must have closed by in one motion
+TAP_CLOSE_DISTANCE = 55     # Distance the fingers must be down to
+TAP_RELEASE_DISTANCE = 65   # Distance they must open past before the next tap
+
+# Landmark smoothing before pinch detection - see landmark_filter.py
+LANDMARK_FILTER = "one_euro"  # "one_euro", "kalman" or None for raw landmarks
+EURO_MIN_CUTOFF = 1.0       # Hz, One Euro cutoff for a still hand
+EURO_BETA = 0.05            # One Euro cutoff increase per pixel/s of speed
+EURO_D_CUTOFF = 1.0         # Hz, One Euro cutoff for the speed estimate
+KALMAN_PROCESS_NOISE = 4e6  # Kalman acceleration variance, (pixels/s^2)^2
+KALMAN_MEASUREMENT_NOISE = 4.0  # Kalman landmark jitter variance, pixels^2
+
+# Fingertip prediction for hit-testing - see prediction.py
+PREDICT_TIP = False         # Hit-test where the index tip will be rather than where it was captured
+PREDICTION_LOOKAHEAD_MS = None  # Milliseconds to extrapolate by (None = the measured capture-to-hit-test delay)
+PREDICTION_MAX_MS = 100     # Most the measured delay is extrapolated by
+
+# Debounce - see gesture_engine.py
+KEY_COOLDOWN_MS = 800       # Milliseconds to wait before allowing the same key again
+
+# Modern style
+PREVIEW_SIZE = (240, 180)   # Camera feed preview in the top right corner
+MAX_PARTICLES = 400         # Most press particles alive at once; the oldest make way for new bursts
@@ -0,0 +1,237 @@
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+from time import perf_counter
+
+import numpy as np
+
+# Runs the hand detector in a worker process, so detection uses another core
+# instead of holding the frame loop (and the GIL) for the whole findHands.
+#
+# Frames go through a ring of slots in one shared-memory block: findHands
+# copies the frame into a free slot and sends only (slot, seq) to the worker,
+# which detects straight from the slot - no frame is ever pickled. What comes
+# back is the landmark arrays, packed into a few small numpy arrays. A slot is
+# free again once its result is back; with every slot in flight the frame is
+# not sent at all ("latest frame wins", counted as skipped).
+#
+# findHands never waits: it returns the newest result that has arrived, which
+# is usually from a frame or two earlier. lockstep=True instead waits for each
+# frame's own result - same hands as the inline detector, for replays and tests.
+#
+# If the worker dies, findHands raises rather than going on returning the
+# last hands it got (a pinch frozen over a key would keep typing it); the
+# shared-memory ring is released either way.
+#
+# The detector itself is built in the worker by factory (mediapipe graphs do
+# not survive pickling), so factory must be picklable: a module-level
+# function or a functools.partial of one.
+
+
+# Hand dicts as (landmarks, bboxes, centers, types) arrays for the result queue
+def pack_hands(hands):
+    if not hands:
+        return None
+    lm = np.array([hand["lmList"] for hand in hands], np.int32)
+    bbox = np.array([hand["bbox"] for hand in hands], np.int32)
+    center = np.array([hand["center"] for hand in hands], np.int32)
+    return lm, bbox, center, [hand.get("type", "Unknown") for hand in hands]
+
+
+def unpack_hands(packed):
+    if packed is None:
+        return []
+    lm, bbox, center, types = packed
+    return [{"lmList": lm[i].tolist(), "bbox": tuple(bbox[i].tolist()), "center": tuple(center[i].tolist()),
+             "type": types[i]} for i in range(len(types))]
+
+
+def _worker(factory, requests, results):
+    from .hand_tracking import find_hands
+
+    try:
+        detector = factory()
+    except Exception as e:
+        results.put(("error", f"{type(e).__name__}: {e}"))
+        return
+    results.put(("ready",))
+    shm = frames = None
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        if request[0] == "ring":
+            # The ring is created by the frame loop on its first frame
+            _, name, shape = request
+            shm = shared_memory.SharedMemory(name=name)
+            frames = np.ndarray(shape, np.uint8, buffer=shm.buf)
+            continue
+        _, slot, seq = request
+        start = perf_counter()
+        hands = find_hands(detector, frames[slot])
+        results.put(("hands", slot, seq, perf_counter() - start, pack_hands(hands)))
+    del detector, frames
+    if shm is not None:
+        shm.close()
+
+
+class ProcessHandDetector():
+    def __init__(self, factory, slots=2, lockstep=False, timeout=60.0):
+        self.slots = slots
+        self.lockstep = lockstep
+        self.timeout = timeout  # Seconds to wait for the worker before giving up on it
+
+        # The ring lives in shared memory, sized by the first frame; slots are
+        # filled in place with np.copyto
+        self.shm = None
+        self.frames = None
+        self.free = list(range(slots))
+        self.closed = False
+
+        # Spawned rather than forked: forking a process that already runs
+        # OpenCV and capture threads can deadlock the child
+        context = multiprocessing.get_context("spawn")
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(target=_worker, name="hand-detector", daemon=True,
+                                       args=(factory, self.requests, self.results))
+        self.process.start()
+
+        self.ready = False
+        self.seq = 0          # Sequence number of the newest frame passed in
+        self.hands = []       # Newest result
+        self.result_seq = 0   # Frame the newest result was detected on
+        self.frames_seen = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0  # Frames not sent because the worker was busy or still starting
+        self.detections = 0
+        self.detect_seconds = 0.0  # Worker time spent in findHands
+        self.first_result = None   # perf_counter() times the first and the newest result arrived
+        self.last_result = None
+        self.result_age = 0        # Sum over frames of how many frames old the returned hands were
+
+    def _handle(self, message):
+        kind = message[0]
+        if kind == "ready":
+            self.ready = True
+        elif kind == "error":
+            self._fail(f"Hand detector process failed to start: {message[1]}")
+        else:
+            _, slot, seq, seconds, packed = message
+            self.free.append(slot)
+            self.detections += 1
+            self.detect_seconds += seconds
+            self.last_result = perf_counter()
+            if self.first_result is None:
+                self.first_result = self.last_result
+            if seq > self.result_seq:
+                self.result_seq = seq
+                self.hands = unpack_hands(packed)
+
+    # Shut the worker down and release the ring, then raise
+    def _fail(self, message):
+        self.close()
+        raise RuntimeError(message)
+
+    def _check_alive(self):
+        if not self.process.is_alive():
+            self._fail(f"Hand detector process exited with code {self.process.exitcode}")
+
+    def _wait(self, until):
+        deadline = perf_counter() + self.timeout
+        while not until():
+            try:
+                self._handle(self.results.get(timeout=0.1))
+            except queue.Empty:
+                self._check_alive()
+                if perf_counter() > deadline:
+                    self._fail(f"No answer from the hand detector process in {self.timeout} s")
+
+    # Whether findHands returns hands detected by the worker yet
+    @property
+    def detecting(self):
+        return self.result_seq > 0
+
+    # Block until the worker has built its detector (loaded the model)
+    def wait_ready(self):
+        self._wait(lambda: self.ready)
+
+    def _open_ring(self, shape):
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slots * int(np.prod(shape)))
+        self.frames = np.ndarray((self.slots,) + shape, np.uint8, buffer=self.shm.buf)
+        self.requests.put(("ring", self.shm.name, self.frames.shape))
+
+    # Results that have arrived so far, without waiting
+    def _drain(self):
+        while True:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                self._check_alive()
+                return
+            self._handle(message)
+
+    def findHands(self, img, draw=False):
+        if self.frames is None:
+            self._open_ring(img.shape)
+        elif img.shape != self.frames.shape[1:]:
+            raise ValueError(f"Frame shape {img.shape} does not match the shared ring's {self.frames.shape[1:]}")
+        self.seq += 1
+        self.frames_seen += 1
+        if self.lockstep:
+            self.wait_ready()
+        else:
+            self._drain()
+
+        if self.ready and self.free:
+            slot = self.free.pop()
+            np.copyto(self.frames[slot], img)
+            self.requests.put(("frame", slot, self.seq))
+            self.frames_sent += 1
+            if self.lockstep:
+                self._wait(lambda: self.result_seq == self.seq)
+        else:
+            self.frames_skipped += 1
+
+        self.result_age += self.seq - self.result_seq if self.result_seq else 0
+        if draw:
+            from .hand_tracking import draw_hand
+            for hand in self.hands:
+                draw_hand(img, hand)
+        return self.hands, img
+
+    # Detections per second of wall time, from the first result to the newest
+    def detector_fps(self):
+        if self.detections < 2:
+            return 0.0
+        span = self.last_result - self.first_result
+        return (self.detections - 1) / span if span > 0 else 0.0
+
+    # Mean worker time of one findHands, in milliseconds
+    def inference_ms(self):
+        return self.detect_seconds / self.detections * 1000 if self.detections else 0.0
+
+    # Average number of frames between a frame and the one its hands came from
+    def mean_result_age(self):
+        return self.result_age / self.frames_seen if self.frames_seen else 0.0
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.process.is_alive():
+            self.requests.put(None)
+            # Keep reading so the worker can flush its last results and exit
+            deadline = perf_counter() + 5.0
+            while self.process.is_alive() and perf_counter() < deadline:
+                try:
+                    self.results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process.join()
+        if self.shm is not None:
+            self.frames = None
+            self.shm.close()
+            self.shm.unlink()
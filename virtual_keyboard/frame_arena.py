@@ -0,0 +1,45 @@
+import cv2
+import numpy as np
+
+# Preallocated image buffers for the frame loop. A buffer is created the first
+# time it is asked for and handed back on every later frame as long as its
+# shape and dtype stay the same; OpenCV writes into it through dst=, so once
+# the first frame is through the loop stops allocating image memory. The
+# contents of a buffer are only valid until it is asked for again, normally on
+# the next frame.
+class FrameArena():
+    def __init__(self):
+        self.buffers = {}
+        self.solids = {}       # (shape, colour) -> solid image to refill buffers from
+        self.allocations = 0   # Buffers (re)allocated so far - flat in steady state
+
+    # Buffer called name, reallocated only when the shape or dtype changes
+    def get(self, name, shape, dtype=np.uint8):
+        shape = tuple(shape)
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self.buffers[name] = np.empty(shape, dtype)
+            self.allocations += 1
+        return buffer
+
+    # Buffer filled with a solid colour, copied from a cached solid image
+    def filled(self, name, shape, color):
+        key = (tuple(shape), tuple(int(c) for c in color))
+        solid = self.solids.get(key)
+        if solid is None:
+            solid = self.solids[key] = np.empty(key[0], np.uint8)
+            solid[:] = color
+        buffer = self.get(name, shape)
+        np.copyto(buffer, solid)
+        return buffer
+
+    # cv2.flip into the buffer called name
+    def flip(self, img, code=1, name="flip"):
+        return cv2.flip(img, code, dst=self.get(name, img.shape, img.dtype))
+
+    # cv2.resize into the buffer called name, or into dst (e.g. a window of a
+    # larger buffer) when given
+    def resize(self, img, size, name="resize", dst=None, interpolation=cv2.INTER_LINEAR):
+        if dst is None:
+            dst = self.get(name, (size[1], size[0]) + img.shape[2:], img.dtype)
+        return cv2.resize(img, size, dst=dst, interpolation=interpolation)
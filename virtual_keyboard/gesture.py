@@ -0,0 +1,134 @@
+from math import hypot
+
+import numpy as np
+
+from .config import (GREEN, HAND_SCALE_REFERENCE, PINCH_MODE, PINCH_THRESHOLD, RED, THUMB_RAISE,
+                     VERTICAL_THRESHOLD, YELLOW)
+from .gesture_engine import TAP_INITIAL, TapDetector
+
+MIN_HAND_SCALE = 4  # Smallest wrist-to-knuckle distance, in pixels, taken as a real hand
+
+
+# Size of a hand in its own landmark coordinates: wrist to middle-finger
+# knuckle (MCP), which stays put while the fingers pinch. None when the two
+# (nearly) coincide, which no real detection gives
+def hand_scale(lmList):
+    wrist, knuckle = lmList[0], lmList[9]
+    scale = hypot(knuckle[0] - wrist[0], knuckle[1] - wrist[1])
+    return scale if scale >= MIN_HAND_SCALE else None
+
+
+# Thumb-index pinch detection. update() measures the first hand every frame
+# and decides whether it is pinching; how long the pinch has been held and
+# when it types a key is up to the gesture engine (gesture_engine.py).
+#
+# The distances are measured in reference pixels: landmark pixels times
+# HAND_SCALE_REFERENCE / hand_scale, so a hand twice as far from the camera
+# measures the same. A hand whose size can't be measured is not measured at
+# all: the frame breaks the pinch, and a warning is printed the first time.
+#
+# trigger is what the engine gets as its pinching input. In "hold" mode it is
+# is_pinching; in "tap" mode it is set only on the frame a tap lands
+# (TapDetector on the thumb-index distance), for an engine without a hold.
+class PinchGesture():
+    def __init__(self, vertical_threshold=VERTICAL_THRESHOLD, pinch_threshold=PINCH_THRESHOLD,
+                 mode=PINCH_MODE, thumb_raise=THUMB_RAISE):
+        self.vertical_threshold = vertical_threshold  # Maximum vertical distance for a pinch
+        self.pinch_threshold = pinch_threshold        # Maximum Euclidean distance for a pinch
+        self.thumb_raise = thumb_raise                # How far the thumb tip must be above its base
+        self.mode = mode
+        self.tap = TapDetector() if mode == "tap" else None
+        self.tap_state = TAP_INITIAL
+        self.trigger = None      # Pinching input for the gesture engine
+
+        # This frame's measurements
+        self.thumb_tip = None
+        self.index_tip = None
+        self.measured = False    # Whether the distances below are from this frame
+        self.scale = 1.0         # Reference pixels per landmark pixel for this hand
+        self.warned_scale = False  # Whether a hand without a size has been reported
+        self.vertical_distance = 0
+        self.euclidean_distance = 0.0
+        self.thumb_raised = False
+        self.is_pinching = None  # None until a hand has been measured
+        self.status = None       # Pinch status message as (text, color, thickness)
+
+    # Thresholds from a calibration profile (calibration.py). They are in the
+    # reference pixels of the profile's hand_scale_reference, rescaled here in
+    # case HAND_SCALE_REFERENCE has changed since it was saved
+    def use_profile(self, profile):
+        k = HAND_SCALE_REFERENCE / profile.get("hand_scale_reference", HAND_SCALE_REFERENCE)
+        self.vertical_threshold = profile["vertical_threshold"] * k
+        self.pinch_threshold = profile["pinch_threshold"] * k
+
+    def update(self, hands, frame_time):
+        self.measured = False
+        self.status = None
+        self.trigger = None
+        self._measure(hands)
+        if self.tap is not None:
+            distance = float(self.euclidean_distance) if self.measured else None
+            self.tap_state = self.tap.step(self.tap_state, frame_time, distance)
+            if hands:
+                self.trigger = self.tap_state.fired
+        elif hands:
+            self.trigger = self.is_pinching
+
+    def _measure(self, hands):
+        if not hands:
+            return
+        lmList = hands[0]["lmList"]  # List of 21 landmarks
+
+        # Get important landmarks
+        self.thumb_tip = thumb_tip = lmList[4]  # Thumb tip
+        self.index_tip = index_tip = lmList[8]  # Index finger tip
+        thumb_base = lmList[2]  # Thumb base (near wrist)
+
+        scale = hand_scale(lmList)
+        if scale is None:
+            if not self.warned_scale:
+                print("Hand landmarks have the wrist on the middle knuckle; no hand size to measure the pinch by")
+                self.warned_scale = True
+            self.is_pinching = False  # Breaks the pinch
+            return
+
+        # Calculate distances for pinch detection, relative to the hand's size
+        try:
+            self.scale = k = HAND_SCALE_REFERENCE / scale
+
+            # Calculate vertical distance between thumb and index finger tips
+            vertical_distance = abs(thumb_tip[1] - index_tip[1]) * k
+            horizontal_distance = abs(thumb_tip[0] - index_tip[0]) * k
+
+            # Calculate euclidean distance for more accuracy
+            euclidean_distance = np.sqrt(vertical_distance**2 + horizontal_distance**2)
+
+            # Check if thumb is raised relative to its base position
+            thumb_raised = (thumb_base[1] - thumb_tip[1]) * k > self.thumb_raise
+
+            # Strict pinch detection with multiple conditions:
+            # 1. Vertical distance must be small
+            # 2. Euclidean distance must be small
+            # 3. Thumb must be raised from base position
+            is_pinching = (vertical_distance < self.vertical_threshold and
+                           euclidean_distance < self.pinch_threshold and
+                           thumb_raised)
+        except Exception as e:
+            print(f"Error calculating pinch: {e}")
+            self.is_pinching = False  # Breaks the pinch
+            return
+
+        self.vertical_distance = vertical_distance
+        self.euclidean_distance = euclidean_distance
+        self.thumb_raised = thumb_raised
+        self.is_pinching = is_pinching
+        self.measured = True
+
+        if is_pinching:
+            self.status = ("PINCHING", GREEN, 3)
+        else:
+            # Show guidance on what's needed to pinch
+            if not thumb_raised:
+                self.status = ("Raise thumb", RED, 2)
+            elif vertical_distance >= self.vertical_threshold:
+                self.status = ("Closer", YELLOW, 2)
@@ -0,0 +1,132 @@
+from collections import namedtuple
+from math import inf
+
+from .config import (HOLD_TIME_MS, KEY_COOLDOWN_MS, TAP_CLOSE_DISTANCE, TAP_DEPTH, TAP_RELEASE_DISTANCE,
+                     TAP_SPEED)
+
+# Pinch-to-type state machine, driven by frame timestamps. Every frame it gets
+# the key under the index fingertip (-1 for none) and whether the hand is
+# pinching (None when no hand was measured - a detector dropout keeps the
+# pinch going), and moves between
+#
+#   idle       no key under the fingertip
+#   hovering   over a key, not pinching
+#   arming     over a key, pinching, hold time not reached yet
+#   committed  the key is typed on this frame
+#   cooldown   over a key typed within its cooldown
+#
+# A pinch commits once it has been held for hold_ms, whatever the frame rate;
+# it may close anywhere and be carried onto a key. A commit consumes the
+# pinch: typing another key takes another full hold, and holding on over the
+# same key repeats it once per cooldown. Every key keeps its own cooldown, so
+# A, B, A does not type the second A before A's cooldown is up.
+#
+# step() is a pure function of the previous state and the frame's inputs: no
+# clock, no I/O, and the state is an immutable tuple. A session can be replayed
+# or run on synthetic input at any speed and always gives the same keys.
+
+IDLE = "idle"
+HOVERING = "hovering"
+ARMING = "arming"
+COMMITTED = "committed"
+COOLDOWN = "cooldown"
+PHASES = (IDLE, HOVERING, ARMING, COMMITTED, COOLDOWN)
+
+# phase, key under the fingertip, onset (time the pinch closed, None with no
+# pinch under way), and the time each key was last committed, indexed by key
+# (button ID) - keys past the end of the tuple have never been typed
+GestureState = namedtuple("GestureState", "phase key onset commits", defaults=(IDLE, -1, None, ()))
+INITIAL = GestureState()
+
+_new = tuple.__new__  # Builds a GestureState without namedtuple's argument handling
+
+
+class GestureEngine():
+    def __init__(self, hold_ms=HOLD_TIME_MS, cooldown_ms=KEY_COOLDOWN_MS):
+        self.hold = hold_ms / 1000          # Seconds a pinch must be held to commit
+        self.cooldown = cooldown_ms / 1000  # Seconds before the same key can be typed again
+
+    # The state after a frame at time now
+    def step(self, state, now, key, pinching):
+        previous, previous_key, previous_onset, commits = state
+        onset = None if previous is COMMITTED else previous_onset
+        if pinching:
+            if onset is None:
+                onset = now
+        elif pinching is not None:
+            onset = None
+
+        if key < 0:
+            phase = IDLE
+        elif key < len(commits) and now - commits[key] < self.cooldown:
+            phase = COOLDOWN
+        elif onset is None:
+            phase = HOVERING
+        elif now - onset >= self.hold:
+            if key >= len(commits):
+                commits += (-inf,) * (key + 1 - len(commits))
+            return _new(GestureState, (COMMITTED, key, onset, commits[:key] + (now,) + commits[key + 1:]))
+        else:
+            phase = ARMING
+        # Most frames change nothing; the state is then handed back as it was
+        if phase is previous and key == previous_key and onset == previous_onset:
+            return state
+        return _new(GestureState, (phase, key, onset, commits))
+
+    # Fraction of the hold done, None with no pinch under way (or one that
+    # has just been used up)
+    def hold_fraction(self, state, now):
+        if state.onset is None or state.phase is COMMITTED:
+            return None
+        if self.hold <= 0:
+            return 1.0
+        return min((now - state.onset) / self.hold, 1.0)
+
+    # Fraction of the cooldown of the key under the fingertip still to go
+    def cooldown_fraction(self, state, now):
+        if state.phase is not COOLDOWN:
+            return 0.0
+        return (self.cooldown - (now - state.commits[state.key])) / self.cooldown
+
+
+# Tap trigger for the "tap" pinch mode: instead of waiting out a hold, a key
+# is typed on the frame a quick closing motion of thumb and index finger
+# lands. It watches the thumb-index distance over time and fires once the
+# distance is falling faster than speed (pixels/s), has fallen by at least
+# depth pixels since the fingers last started closing, and is down to
+# close_distance. It then stays latched until the fingers open past
+# release_distance, so one tap fires once however long the fingers stay
+# together and a wobble around close_distance does not fire again.
+#
+# Like GestureEngine.step, step() is pure; the state is (distance and time of
+# the last sample, peak distance of the current closing motion, latched,
+# fired on this sample). fired goes to GestureEngine.step as its pinching
+# input, with an engine of hold_ms=0.
+TapState = namedtuple("TapState", "distance time peak latched fired", defaults=(None, None, 0.0, False, False))
+TAP_INITIAL = TapState()
+
+
+class TapDetector():
+    def __init__(self, speed=TAP_SPEED, depth=TAP_DEPTH, close_distance=TAP_CLOSE_DISTANCE,
+                 release_distance=TAP_RELEASE_DISTANCE):
+        self.speed = speed                        # Pixels/s the distance must be falling at
+        self.depth = depth                        # Pixels it must have fallen in this motion
+        self.close_distance = close_distance      # Distance the fingers must be down to
+        self.release_distance = release_distance  # Distance they must open past to re-arm
+
+    # The state after a distance sample at time now (None: no hand measured)
+    def step(self, state, now, distance):
+        last, last_time, peak, latched, _ = state
+        if distance is None:
+            return _new(TapState, (last, last_time, peak, latched, False))
+        if latched and distance > self.release_distance:
+            latched = False
+        if last is None or now <= last_time:
+            return _new(TapState, (distance, now, distance, latched, False))
+
+        velocity = (distance - last) / (now - last_time)
+        if velocity >= 0:
+            peak = distance  # Opening or still: the next closing motion starts from here
+        fired = (not latched and velocity <= -self.speed and peak - distance >= self.depth
+                 and distance <= self.close_distance)
+        return _new(TapState, (distance, now, peak, latched or fired, fired))
@@ -0,0 +1,73 @@
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+# Gradient engine for key faces, the text box and the glossy highlight.
+# Every patch is built once with NumPy broadcasting and memoized; callers get
+# a read-only broadcast view that can be assigned straight into an image slice.
+
+# One row/column of colour values for a linear blend from color1 to color2
+@lru_cache(maxsize=256)
+def _ramp(n, color1, color2):
+    blend = (np.arange(n, dtype=np.float64) / n)[:, None]
+    # Same expression as the per-line loop, so the float rounding and the int()
+    # truncation give the same values
+    ramp = (np.array(color1, np.float64) * (1 - blend) + np.array(color2, np.float64) * blend).astype(np.uint8)
+    ramp.flags.writeable = False
+    return ramp
+
+
+# Gradient patch matching the old per-row cv2.line loop: lines ran from x to x+w
+# (inclusive) so a vertical patch is h rows by w+1 columns, and vice versa
+@lru_cache(maxsize=256)
+def gradient_patch(w, h, color1, color2, vertical=True):
+    if vertical:
+        return np.broadcast_to(_ramp(h, color1, color2)[:, None, :], (h, w + 1, 3))
+    return np.broadcast_to(_ramp(w, color1, color2)[None, :, :], (h + 1, w, 3))
+
+
+# Glossy highlight at the top of a key: KEY_LIGHT blended towards white,
+# fading from 40% at the top edge to 0 over the first quarter of the key
+@lru_cache(maxsize=64)
+def gloss_patch(w, h, base):
+    gloss_height = h // 4
+    alpha = 0.4 * (1.0 - np.arange(gloss_height, dtype=np.float64) / gloss_height)
+    rows = (255 * alpha[:, None] + np.array(base, np.float64) * (1 - alpha[:, None])).astype(np.uint8)
+    rows.flags.writeable = False
+    return np.broadcast_to(rows[:, None, :], (gloss_height, max(w - 3, 0), 3))
+
+
+# Copy a patch into img at (x, y), clipped to the image bounds like cv2.line was
+def blit(img, x, y, patch):
+    ph, pw = patch.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + pw, img.shape[1]), min(y + ph, img.shape[0])
+    if x0 < x1 and y0 < y1:
+        img[y0:y1, x0:x1] = patch[y0 - y:y1 - y, x0 - x:x1 - x]
+    return img
+
+
+# Drop-in replacement for the old per-row gradient loop
+def get_key_gradient(img, x, y, w, h, color1, color2, vertical=True):
+    patch = gradient_patch(w, h, tuple(color1), tuple(color2), vertical)
+    return blit(img, x, y, patch)
+
+
+# Draw the glossy highlight over the top of a w x h key at (x, y)
+def draw_gloss(img, x, y, w, h, base):
+    if h // 4 == 0:
+        return img
+    return blit(img, x + 2, y + 2, gloss_patch(w, h, tuple(base)))
+
+
+# Corner lines of a key, drawn exactly like cvzone.cornerRect(img, bbox, l, t,
+# rt=0, colorC=color) - without importing cvzone, which pulls in urllib and
+# its other utilities before the first frame can be shown
+def corner_rect(img, bbox, l=30, t=5, color=(0, 255, 0)):
+    x, y, w, h = bbox
+    x1, y1 = x + w, y + h
+    for cx, cy, dx, dy in ((x, y, l, l), (x1, y, -l, l), (x, y1, l, -l), (x1, y1, -l, -l)):
+        cv2.line(img, (cx, cy), (cx + dx, cy), color, t)
+        cv2.line(img, (cx, cy), (cx, cy + dy), color, t)
+    return img
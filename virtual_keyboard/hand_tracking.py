@@ -0,0 +1,388 @@
+import threading
+from collections import deque
+from math import ceil
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from .config import DETECTOR_BUDGET, INFERENCE_SIZE, TRACK_HAND_ROI
+
+
+# cvzone's findHands returns (hands, img) when drawing and, depending on the
+# release, either (hands, img) or just hands with draw=False
+def find_hands(detector, img):
+    result = detector.findHands(img, draw=False)
+    if isinstance(result, tuple):
+        return result[0]
+    return result
+
+
+# Map a cvzone hand dict through display = point * scale + offset
+def transform_hand(hand, scale, offset):
+    lm = np.asarray(hand["lmList"], np.float64)
+    mapped = dict(hand)
+    mapped["lmList"] = (lm * scale[:lm.shape[1]] + offset[:lm.shape[1]]).astype(int).tolist()
+    x, y, w, h = hand["bbox"]
+    mapped["bbox"] = (int(x * scale[0] + offset[0]), int(y * scale[1] + offset[1]),
+                      int(w * scale[0]), int(h * scale[1]))
+    cx, cy = hand["center"]
+    mapped["center"] = (int(cx * scale[0] + offset[0]), int(cy * scale[1] + offset[1]))
+    return mapped
+
+
+# Landmark dots and bounding box, roughly what cvzone draws
+def draw_hand(img, hand):
+    for x, y in [(p[0], p[1]) for p in hand["lmList"]]:
+        cv2.circle(img, (x, y), 4, (255, 0, 255), cv2.FILLED)
+    x, y, w, h = hand["bbox"]
+    cv2.rectangle(img, (x - 20, y - 20), (x + w + 20, y + h + 20), (255, 0, 255), 2)
+    return img
+
+
+# Runs the hand detector on a downscaled copy of the frame. The copy is resized
+# into a reused buffer and the landmarks come back through one precomputed
+# affine transform, straight into display coordinates: display is the
+# (x, y, w, h) rectangle the frame is shown in, by default the frame itself.
+class ScaledHandDetector():
+    def __init__(self, detector, inference_size=(640, 360), display=None):
+        self.detector = detector
+        self.inference_size = inference_size
+        self.display = display
+        self.frame_size = None
+        self.buffer = None
+
+    def _prepare(self, frame_w, frame_h):
+        iw, ih = self.inference_size
+        dx, dy, dw, dh = self.display or (0, 0, frame_w, frame_h)
+        self.frame_size = (frame_w, frame_h)
+        self.buffer = np.empty((ih, iw, 3), np.uint8)
+        # Inference pixels -> frame pixels (for drawing) and -> display coordinates
+        self.frame_scale = np.array([frame_w / iw, frame_h / ih, frame_w / iw])
+        self.scale = np.array([dw / iw, dh / ih, dw / iw])
+        self.offset = np.array([dx, dy, 0.0])
+
+    def findHands(self, img, draw=False):
+        frame_h, frame_w = img.shape[:2]
+        if self.frame_size != (frame_w, frame_h):
+            self._prepare(frame_w, frame_h)
+
+        if self.inference_size == (frame_w, frame_h):
+            small = img
+        else:
+            small = cv2.resize(img, self.inference_size, dst=self.buffer, interpolation=cv2.INTER_AREA)
+        found = find_hands(self.detector, small)
+
+        hands = [transform_hand(hand, self.scale, self.offset) for hand in found]
+        if draw:
+            for hand in found:
+                draw_hand(img, transform_hand(hand, self.frame_scale, np.zeros(3)))
+        return hands, img
+
+
+# Tracking mode: once a hand has been found, the next frame's search is limited
+# to a padded crop around its bounding box. Falls back to a full-frame search
+# when the crop finds nothing (cvzone reports no per-hand score, so losing the
+# hand stands in for a confidence drop) or when the hand touches the crop edge
+# and is leaving it. Landmarks are translated back to frame coordinates, so the
+# pinch logic and the key hit-test are unchanged.
+#
+# Wraps the cvzone detector directly; put it inside a ScaledHandDetector to
+# take the crop from the downscaled inference frame. The detector must be in
+# static mode: in tracking mode mediapipe seeds each frame with the previous
+# frame's landmarks, which sit somewhere else once the crop has moved or the
+# search has gone back to the full frame.
+class RoiHandDetector():
+    def __init__(self, detector, padding=0.6, min_size=160, edge_margin=4):
+        self.detector = detector
+        self.padding = padding          # Crop padding as a fraction of the hand box size
+        self.min_size = min_size        # Smallest crop side in pixels
+        self.edge_margin = edge_margin  # Landmarks this close to a crop edge count as leaving it
+        self.roi = None                 # (x0, y0, x1, y1) crop for the next frame
+        self.frames = 0
+        self.roi_frames = 0             # Frames served from the crop
+
+    # Fraction of frames whose hands came from the crop rather than a full search
+    def roi_fraction(self):
+        return self.roi_frames / self.frames if self.frames else 0.0
+
+    def _next_roi(self, hand, frame_w, frame_h):
+        x, y, w, h = hand["bbox"]
+        side = max(w, h) * (1 + 2 * self.padding)
+        side = max(side, self.min_size)
+        cx, cy = x + w / 2, y + h / 2
+        x0, y0 = int(max(cx - side / 2, 0)), int(max(cy - side / 2, 0))
+        x1, y1 = int(min(cx + side / 2, frame_w)), int(min(cy + side / 2, frame_h))
+        return (x0, y0, x1, y1)
+
+    def _inside(self, hand, roi):
+        x0, y0, x1, y1 = roi
+        m = self.edge_margin
+        return all(x0 + m <= p[0] < x1 - m and y0 + m <= p[1] < y1 - m for p in hand["lmList"])
+
+    def findHands(self, img, draw=False):
+        frame_h, frame_w = img.shape[:2]
+        self.frames += 1
+        hands = []
+
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            found = find_hands(self.detector, img[y0:y1, x0:x1])
+            offset = np.array([x0, y0, 0.0])
+            hands = [transform_hand(hand, np.ones(3), offset) for hand in found]
+            if hands and self._inside(hands[0], self.roi):
+                self.roi_frames += 1
+            else:
+                hands = []
+
+        if not hands:
+            hands = find_hands(self.detector, img)
+
+        self.roi = self._next_roi(hands[0], frame_w, frame_h) if hands else None
+        if draw:
+            for hand in hands:
+                draw_hand(img, hand)
+        return hands, img
+
+
+# Detector cadence control. The real detector runs every `every` frames, or
+# sooner when the hand moves fast; in between, the 21 landmarks are carried
+# forward with pyramidal Lucas-Kanade optical flow on a small grayscale copy
+# of the frame. The hands it returns look exactly like detector output, so
+# the pinch and hover logic can't tell the difference.
+#
+# With a frame_budget (seconds of detection work allowed per frame) the
+# cadence adapts: every = ceil((detect - flow) / (budget - flow)), from the
+# measured average cost of a detection and of a flow step.
+#
+# Works in the coordinates of the image it is given; put it inside a
+# ScaledHandDetector so the flow runs on the downscaled inference frame.
+class CadenceHandDetector():
+    def __init__(self, detector, every=3, max_every=8, motion_threshold=12.0,
+                 frame_budget=None, flow_scale=0.5):
+        self.detector = detector
+        self.every = every                        # Run the detector every N frames
+        self.max_every = max_every
+        self.motion_threshold = motion_threshold  # Median landmark motion (px) that forces a detection
+        self.frame_budget = frame_budget
+        self.flow_scale = flow_scale              # Flow image size relative to the input
+
+        self.hands = []
+        self.points = None        # Last landmarks as float32 (21, 1, 2) in flow image pixels
+        self.prev_gray = None
+        self.gray = None
+        self.small = None
+        self.since_detect = 0
+        self.detect_cost = None   # Moving averages in seconds
+        self.flow_cost = None
+        self.detections = deque(maxlen=64)  # perf_counter() of recent detector runs
+        self.frames = 0
+        self.interpolated_frames = 0
+
+    def _to_gray(self, img):
+        h, w = img.shape[:2]
+        size = (max(int(w * self.flow_scale), 1), max(int(h * self.flow_scale), 1))
+        shape = (size[1], size[0])
+        if self.gray is None or self.gray.shape != shape:
+            self.gray = np.empty(shape, np.uint8)
+            self.small = np.empty(shape + (3,), np.uint8)
+        if self.prev_gray is not None and self.prev_gray.shape != shape:
+            self.prev_gray = None
+        small = cv2.resize(img, size, dst=self.small, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self.gray)
+
+    def _average(self, current, sample):
+        return sample if current is None else 0.8 * current + 0.2 * sample
+
+    def _adapt(self):
+        if not self.frame_budget or self.detect_cost is None:
+            return
+        flow = self.flow_cost or 0.0
+        if self.frame_budget <= flow:
+            self.every = self.max_every
+        else:
+            needed = ceil((self.detect_cost - flow) / (self.frame_budget - flow))
+            self.every = min(max(needed, 1), self.max_every)
+
+    def _detect(self, img):
+        start = perf_counter()
+        self.hands = find_hands(self.detector, img)
+        self.detect_cost = self._average(self.detect_cost, perf_counter() - start)
+        self.detections.append(perf_counter())
+        self.since_detect = 0
+        self._adapt()
+        if self.hands:
+            lm = np.asarray(self.hands[0]["lmList"], np.float32)[:, :2]
+            self.points = (lm * self.flow_scale).reshape(-1, 1, 2)
+        else:
+            self.points = None
+        return self.hands
+
+    # Carry the last landmarks into this frame; None when tracking is unreliable
+    def _interpolate(self, gray):
+        start = perf_counter()
+        points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None,
+                                                     winSize=(15, 15), maxLevel=2)
+        self.flow_cost = self._average(self.flow_cost, perf_counter() - start)
+        if points is None or status.sum() < len(status) * 0.7:
+            return None
+
+        motion = np.median(np.linalg.norm(points - self.points, axis=2)) / self.flow_scale
+        if motion > self.motion_threshold:
+            return None
+
+        self.points = points
+        lm = points.reshape(-1, 2) / self.flow_scale
+        hand = dict(self.hands[0])
+        xy = lm.astype(int)
+        # Depth isn't tracked by the flow, it keeps its last detected value
+        hand["lmList"] = [[int(x), int(y)] + list(p[2:]) for (x, y), p in zip(xy, hand["lmList"])]
+        x0, y0 = xy.min(axis=0)
+        x1, y1 = xy.max(axis=0)
+        hand["bbox"] = (int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+        hand["center"] = (int((x0 + x1) // 2), int((y0 + y1) // 2))
+        self.hands = [hand] + self.hands[1:]
+        self.since_detect += 1
+        self.interpolated_frames += 1
+        return self.hands
+
+    # Detector runs per second over the recent window
+    def detector_fps(self):
+        if len(self.detections) < 2:
+            return 0.0
+        span = self.detections[-1] - self.detections[0]
+        return (len(self.detections) - 1) / span if span > 0 else 0.0
+
+    def findHands(self, img, draw=False):
+        self.frames += 1
+        gray = self._to_gray(img)
+
+        hands = None
+        if self.points is not None and self.prev_gray is not None and self.since_detect + 1 < self.every:
+            hands = self._interpolate(gray)
+        if hands is None:
+            hands = self._detect(img)
+
+        # Keep the flow image from this frame for the next one
+        self.prev_gray, self.gray = gray, self.prev_gray
+        if draw:
+            for hand in hands:
+                draw_hand(img, hand)
+        return hands, img
+
+
+# The detector chain the keyboard runs: cvzone's detector (increased
+# confidence for better detection), searching around the last hand, on an
+# adaptive cadence, on a downscaled copy of the frame. Landmarks come back in
+# display = (x, y, w, h) screen coordinates, by default the frame itself.
+#
+# With warmup the detector runs once on a blank frame before it is wrapped:
+# mediapipe sets up its graph on the first inference, which would otherwise
+# stall the first real frame (and skew the cadence's cost estimate).
+def create_detector(display=None, inference_size=INFERENCE_SIZE, track_roi=TRACK_HAND_ROI,
+                    budget=DETECTOR_BUDGET, warmup=True):
+    from cvzone.HandTrackingModule import HandDetector
+    detector = HandDetector(staticMode=track_roi, detectionCon=0.9, maxHands=1)
+    if warmup:
+        find_hands(detector, np.zeros((inference_size[1], inference_size[0], 3), np.uint8))
+    if track_roi:
+        detector = RoiHandDetector(detector)
+    if budget:
+        detector = CadenceHandDetector(detector, every=2, frame_budget=budget)
+    return ScaledHandDetector(detector, inference_size, display=display)
+
+
+# Builds the detector on a background thread - importing mediapipe, loading
+# and warming up the model take seconds, and the keyboard and the camera can
+# be up in the meantime. Until the detector is ready findHands finds no hands;
+# wait=True blocks the first call until it is ready instead, so a replay sees
+# the same hands as with the detector built up front.
+class BackgroundHandDetector():
+    def __init__(self, factory, wait=False, clock=perf_counter):
+        self.factory = factory
+        self.wait = wait
+        self.clock = clock
+        self.detector = None
+        self.error = None
+        self.ready_at = None  # Clock time the detector became ready
+        self.loaded = threading.Event()
+        self.thread = threading.Thread(target=self._load, name="detector-load", daemon=True)
+        self.thread.start()
+
+    def _load(self):
+        try:
+            self.detector = self.factory()
+            self.ready_at = self.clock()
+        except Exception as e:
+            self.error = e
+        self.loaded.set()
+
+    @property
+    def ready(self):
+        return self.detector is not None
+
+    # Whether findHands returns the model's hands yet
+    @property
+    def detecting(self):
+        return self.ready
+
+    # Block until the detector is built; raises whatever building it raised
+    def wait_ready(self):
+        self.loaded.wait()
+        if self.error is not None:
+            raise RuntimeError(f"Hand detector failed to load: {self.error}") from self.error
+
+    def findHands(self, img, draw=False):
+        if self.wait or self.loaded.is_set():
+            self.wait_ready()
+        if self.detector is None:
+            return [], img
+        return self.detector.findHands(img, draw=draw)
+
+
+# Summary lines for every wrapper in a detector chain
+def detector_report(detector):
+    from .detector_process import ProcessHandDetector  # Not imported at startup unless it is used
+    lines = []
+    while detector is not None:
+        if isinstance(detector, CadenceHandDetector):
+            lines.append(f"Detector: {detector.detector_fps():.1f} FPS, running every {detector.every} frames, "
+                         f"{detector.interpolated_frames}/{detector.frames} frames from optical flow")
+        elif isinstance(detector, RoiHandDetector):
+            lines.append(f"Hand ROI: {detector.roi_fraction():.0%} of detections served from the crop")
+        elif isinstance(detector, ProcessHandDetector):
+            lines.append(f"Detector process: {detector.detector_fps():.1f} FPS "
+                         f"({detector.inference_ms():.1f} ms per inference), {detector.detections} detections, "
+                         f"{detector.frames_skipped}/{detector.frames_seen} frames skipped, "
+                         f"hands {detector.mean_result_age():.1f} frames old on average")
+        detector = getattr(detector, "detector", None)
+    return lines
+
+
+# Stop whatever in a detector chain holds a process or a file open
+def close_detector(detector):
+    while detector is not None:
+        if hasattr(detector, "close"):
+            detector.close()
+        detector = getattr(detector, "detector", None)
+
+
+# Whether the hands coming out of a detector chain are the model's yet -
+# False while a background or process detector is still loading
+def detector_live(detector):
+    while detector is not None:
+        if not getattr(detector, "detecting", True):
+            return False
+        detector = getattr(detector, "detector", None)
+    return True
+
+
+# Clock time the model of a detector chain finished loading in the
+# background, None while it is loading or when it was built up front
+def detector_ready_at(detector):
+    while detector is not None:
+        ready_at = getattr(detector, "ready_at", None)
+        if ready_at is not None:
+            return ready_at
+        detector = getattr(detector, "detector", None)
+    return None
@@ -0,0 +1,183 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+from .key_output import KeyInjector
+from .landmark_trace import LandmarkTraceReader, record_hands
+
+# Stand-ins for the camera, window, keyboard and clock so the keyboard can run
+# without hardware - on build servers, in benchmarks and in regression
+# replays. They plug into the pipeline as its stages (see cli.py).
+#
+# Landmark traces are JSON lines, one per frame:
+#   {"t": 12.345, "hands": [{"lmList": [[x, y, z], ...], "bbox": [x, y, w, h],
+#                            "center": [cx, cy], "type": "Right"}]}
+# with landmarks in the coordinates the style's detector returns. Binary
+# traces written by landmark_trace.LandmarkTraceWriter replay the same way.
+
+
+# Clock that only moves when the replay says so, so cooldowns and pinch holds
+# replay the same way every time and as fast as the machine can go
+class ManualClock():
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+# Reads a video file frame by frame in place of the camera and steps the
+# clock to each frame's capture time
+class VideoReplay():
+    def __init__(self, path, clock, fps=None):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video: {path}")
+        self.clock = clock
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.start = clock()
+        self.frames = 0
+        self.finished = False
+        self.last_timestamp = self.start
+
+    def read(self):
+        success, img = self.cap.read()
+        if not success:
+            self.finished = True
+            return False, None
+        self.clock.now = self.start + self.frames / self.fps
+        self.last_timestamp = self.clock.now
+        self.frames += 1
+        return True, img
+
+    def release(self):
+        self.cap.release()
+
+
+# Replays a recorded landmark trace: acts as both the camera (blank frames,
+# clock set to the recorded time) and the hand detector (the recorded hands).
+# path is a JSON-lines file or a binary trace directory, which is streamed.
+class TraceReplay():
+    def __init__(self, path, clock, shape=(720, 1280, 3)):
+        self.records = self._binary(path) if os.path.isdir(path) else self._json(path)
+        self.clock = clock
+        self.blank = np.zeros(shape, np.uint8)
+        self.hands = []
+        self.finished = False
+        self.last_timestamp = clock()
+
+    def _json(self, path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["t"], record["hands"]
+
+    def _binary(self, path):
+        for record in LandmarkTraceReader(path):
+            yield float(record["timestamp"]), record_hands(record)
+
+    def read(self):
+        record = next(self.records, None)
+        if record is None:
+            self.finished = True
+            self.hands = []
+            return False, None
+        self.clock.now, self.hands = record
+        self.last_timestamp = self.clock.now
+        return True, self.blank
+
+    def findHands(self, img, draw=False):
+        return self.hands, img
+
+    def release(self):
+        pass
+
+
+# Wraps a detector and writes what it returns to a landmark trace
+class TraceRecorder():
+    def __init__(self, detector, path, clock):
+        self.detector = detector
+        self.clock = clock
+        self.file = open(path, "w")
+
+    def findHands(self, img, draw=False):
+        hands, img = self.detector.findHands(img, draw=draw)
+        record = {"t": self.clock(),
+                  "hands": [{"lmList": [list(map(int, p)) for p in hand["lmList"]],
+                             "bbox": list(map(int, hand["bbox"])),
+                             "center": list(map(int, hand["center"])),
+                             "type": hand.get("type", "Unknown")} for hand in hands]}
+        self.file.write(json.dumps(record) + "\n")
+        return hands, img
+
+    def close(self):
+        self.file.close()
+
+
+# Window replacement that shows nothing and never reports a key press
+class NullDisplay():
+    def __init__(self):
+        self.frames = 0
+
+    def imshow(self, name, img):
+        self.frames += 1
+
+    def waitKey(self, delay=0):
+        return -1
+
+    def destroyAllWindows(self):
+        pass
+
+
+# Window replacement that writes every shown frame to a video file
+class VideoFileDisplay(NullDisplay):
+    def __init__(self, path, fps=30.0):
+        super().__init__()
+        self.path = path
+        self.fps = fps
+        self.writer = None
+
+    def imshow(self, name, img):
+        if self.writer is None:
+            h, w = img.shape[:2]
+            self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*"MJPG"), self.fps, (w, h))
+        self.writer.write(img)
+        self.frames += 1
+
+    def destroyAllWindows(self):
+        if self.writer is not None:
+            self.writer.release()
+
+
+# Special keys by name, in place of pynput's Key
+class KeyNames():
+    def __getattr__(self, name):
+        return name
+
+
+# Keyboard replacement that records every press, release and type call
+class RecordingKeyboard():
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []  # (time, action, key)
+
+    def press(self, key):
+        self.events.append((self.clock(), "press", key))
+
+    def release(self, key):
+        self.events.append((self.clock(), "release", key))
+
+    def type(self, text):
+        self.events.append((self.clock(), "type", text))
+
+
+# Key output that records instead of typing, without the press/release delays
+def recording_output(clock):
+    keyboard = RecordingKeyboard(clock)
+    return KeyInjector(keyboard, keys=KeyNames(), sleep=lambda seconds: None)
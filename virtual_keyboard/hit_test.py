@@ -0,0 +1,50 @@
+import numpy as np
+
+NO_BUTTON = 0xFFFF  # Label for pixels that are not over any key
+
+# The button layout compiled into a uint16 label image at canvas resolution:
+# each pixel holds the index of the key under it, so resolving the fingertip
+# to a key is a single array lookup instead of a walk over every button.
+#
+# Per-key state lives in arrays indexed by the same ID (each button gets its
+# index as button.id), which turns resets into vectorized operations.
+class ButtonMap():
+    def __init__(self, buttonList, shape):
+        h, w = shape[:2]
+        self.labels = np.full((h, w), NO_BUTTON, np.uint16)
+        for i, button in enumerate(buttonList):
+            x, y = button.pos
+            bw, bh = button.size
+            # Strictly inside the key, like x < px < x + w
+            self.labels[max(y + 1, 0):max(y + bh, 0), max(x + 1, 0):max(x + bw, 0)] = i
+            button.id = i
+
+        n = len(buttonList)
+        self.buttons = buttonList
+        self.pressed = np.zeros(n, bool)               # Key committed this frame
+        self.hover_frames = np.zeros(n, np.int32)      # Consecutive frames the fingertip was over the key
+
+    # Index of the key under (x, y), or -1
+    def lookup(self, x, y):
+        x, y = int(x), int(y)
+        if 0 <= y < self.labels.shape[0] and 0 <= x < self.labels.shape[1]:
+            label = self.labels[y, x]
+            if label != NO_BUTTON:
+                return int(label)
+        return -1
+
+    def reset_pressed(self):
+        self.pressed[:] = False
+
+    # Count hover frames for the key under the finger and clear all others
+    def update_hover(self, index):
+        if index < 0:
+            self.hover_frames[:] = 0
+            return 0
+        count = self.hover_frames[index] + 1
+        self.hover_frames[:] = 0
+        self.hover_frames[index] = count
+        return count
+
+    def press(self, index):
+        self.pressed[index] = True
@@ -0,0 +1,175 @@
+import queue
+import threading
+from collections import deque
+from time import perf_counter, sleep
+
+# Virtual keys that map to a single special key press, by pynput Key name
+SPECIAL_KEYS = {
+    "⏎": "enter",
+    "↑": "up",
+    "↓": "down",
+    "←": "left",
+    "→": "right",
+    "CTRL": "ctrl",
+    "ALT": "alt",
+}
+
+# Names used in the log messages for special keys
+KEY_NAMES = {
+    "⏎": "ENTER",
+    "↑": "UP arrow",
+    "↓": "DOWN arrow",
+    "←": "LEFT arrow",
+    "→": "RIGHT arrow",
+    "CTRL": "CTRL",
+    "ALT": "ALT",
+}
+
+
+# Sends key presses to the OS on a worker thread. The press/release delays and
+# fallback chains used to run inline and stalled the frame loop for up to
+# 150 ms per keystroke; now the loop only enqueues the key and carries on.
+#
+# keys is the namespace special keys are looked up in (pynput's Key by
+# default, imported lazily so headless runs don't need a display server) and
+# sleep is the delay used between press and release. A key can carry a tag
+# (a latency.Keystroke) whose done() gets the submit-to-injected duration.
+class KeyInjector():
+    def __init__(self, keyboard, maxsize=32, clock=perf_counter, keys=None, sleep=sleep):
+        if keys is None:
+            from pynput.keyboard import Key as keys
+        self.keyboard = keyboard
+        self.keys = keys
+        self.sleep = sleep
+        self.clock = clock
+        self.queue = queue.Queue(maxsize)
+        self.latencies = deque(maxlen=256)  # Seconds from submit() to injection complete
+        self.injected = 0
+        self.dropped = 0     # Keys rejected because the queue was full
+        self.max_depth = 0
+        self.thread = threading.Thread(target=self._run, name="key-output", daemon=True)
+        self.thread.start()
+
+    # Queue a virtual key for injection; never blocks
+    def submit(self, key, tag=None):
+        try:
+            self.queue.put_nowait((key, self.clock(), tag))
+        except queue.Full:
+            self.dropped += 1
+            print(f"Key queue full, dropped: {key}")
+            return False
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            key, submitted, tag = item
+            self.inject(key)
+            latency = self.clock() - submitted
+            self.latencies.append(latency)
+            self.injected += 1
+            if tag is not None:
+                tag.done(latency)
+
+    # Press a virtual key with the same fallbacks the frame loop used to run inline
+    def inject(self, key):
+        keyboard, Key, sleep = self.keyboard, self.keys, self.sleep
+        if key == "⌫":  # Backspace key
+            try:
+                # First attempt with regular backspace
+                keyboard.press(Key.backspace)
+                sleep(0.03)  # Small delay for reliable operation
+                keyboard.release(Key.backspace)
+                print("Backspace pressed")
+            except Exception as e:
+                print(f"Backspace error: {e}")
+                try:
+                    # Try alternate method
+                    keyboard.type('\b')
+                except Exception:
+                    pass
+
+        elif key == "SPACE":
+            try:
+                keyboard.press(Key.space)
+                sleep(0.05)  # Brief delay
+                keyboard.release(Key.space)
+                print("Space pressed")
+            except Exception as e:
+                print(f"Space error: {e}")
+                try:
+                    # Fallback method
+                    keyboard.type(" ")
+                except Exception:
+                    pass
+
+        elif key in SPECIAL_KEYS:
+            special = getattr(Key, SPECIAL_KEYS[key])
+            try:
+                keyboard.press(special)
+                sleep(0.05)
+                keyboard.release(special)
+                print(f"{KEY_NAMES[key]} pressed")
+            except Exception as e:
+                print(f"{KEY_NAMES[key]} error: {e}")
+
+        else:
+            # Normal key press - try multiple methods for reliability
+            key_char = key.lower()  # Use lowercase for typing
+            try:
+                # First method - type directly
+                keyboard.type(key_char)
+                print(f"Typed key: {key_char}")
+            except Exception as e:
+                print(f"Type error: {e}")
+
+                # Second method - press and release with delay
+                try:
+                    keyboard.press(key_char)
+                    sleep(0.05)  # Short delay
+                    keyboard.release(key_char)
+                    print(f"Press-release: {key_char}")
+                except Exception as e2:
+                    print(f"Press-release error: {e2}")
+
+    def stats(self):
+        latencies = list(self.latencies)
+        return {"injected": self.injected,
+                "dropped": self.dropped,
+                "queue_depth": self.depth(),
+                "max_queue_depth": self.max_depth,
+                "latency_ms_mean": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+                "latency_ms_max": 1000 * max(latencies) if latencies else 0.0}
+
+    def report(self):
+        s = self.stats()
+        return [f"Key output: {s['injected']} keys injected, {s['dropped']} dropped, "
+                f"queue depth max {s['max_queue_depth']}, injection {s['latency_ms_mean']:.1f} ms mean, "
+                f"{s['latency_ms_max']:.1f} ms max"]
+
+    # Finish the queued keys and stop the worker
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+
+# Output stage that drops every key - for benchmarking the frame loop without
+# a keyboard or the worker thread. Keys count as injected straight away.
+class NullOutput():
+    def __init__(self):
+        self.injected = 0
+
+    def submit(self, key, tag=None):
+        self.injected += 1
+        if tag is not None:
+            tag.done(0.0)
+        return True
+
+    def close(self):
+        pass
@@ -0,0 +1,135 @@
+from math import pi
+
+import numpy as np
+
+from .config import EURO_BETA, EURO_D_CUTOFF, EURO_MIN_CUTOFF, KALMAN_MEASUREMENT_NOISE, KALMAN_PROCESS_NOISE
+
+# Landmark smoothing between the detector and the pinch/hover logic. The
+# detector's landmarks jitter by a pixel or two from frame to frame even on a
+# still hand, and a pinch sitting close to VERTICAL_THRESHOLD/PINCH_THRESHOLD
+# flickers open for a frame, which throws the whole hold away. The filters
+# here run on all 21x3 coordinates of a hand at once as numpy arrays.
+#
+# OneEuroFilter is an adaptive low-pass (Casiez et al., CHI 2012): heavy
+# smoothing while a landmark is still, less and less as it speeds up, so
+# jitter goes without adding lag to real movement. KalmanFilter is a
+# constant-velocity Kalman filter per coordinate, for comparison.
+#
+# LandmarkSmoother keeps one filter per tracked hand and drops it as soon as
+# that hand is lost, so a hand coming back does not get pulled towards where
+# the last one was.
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter():
+    def __init__(self, min_cutoff=EURO_MIN_CUTOFF, beta=EURO_BETA, d_cutoff=EURO_D_CUTOFF):
+        self.min_cutoff = min_cutoff  # Hz, cutoff for a still landmark
+        self.beta = beta              # How fast the cutoff rises with speed (per pixel/s)
+        self.d_cutoff = d_cutoff      # Hz, cutoff for the speed estimate
+        self.x = None                 # Filtered coordinates
+        self.dx = None                # Filtered speed, per coordinate
+        self.t = None
+
+    def __call__(self, x, t):
+        if self.x is None:
+            self.x = x.astype(np.float64)
+            self.dx = np.zeros_like(self.x)
+            self.t = t
+            return self.x
+        dt = t - self.t
+        if dt <= 0:
+            return self.x
+        self.t = t
+        dx = (x - self.x) / dt
+        self.dx += _alpha(self.d_cutoff, dt) * (dx - self.dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.dx)
+        self.x += _alpha(cutoff, dt) * (x - self.x)
+        return self.x
+
+
+class KalmanFilter():
+    def __init__(self, process_noise=KALMAN_PROCESS_NOISE, measurement_noise=KALMAN_MEASUREMENT_NOISE):
+        self.q = process_noise       # Acceleration variance, (pixels/s^2)^2
+        self.r = measurement_noise   # Landmark jitter variance, pixels^2
+        self.x = None                # Position estimate per coordinate
+        self.v = None                # Velocity estimate per coordinate
+        self.p = None                # Covariance entries (pp, pv, vv), one array each
+        self.t = None
+
+    def __call__(self, x, t):
+        if self.x is None:
+            self.x = x.astype(np.float64)
+            self.v = np.zeros_like(self.x)
+            self.p = [np.full_like(self.x, self.r), np.zeros_like(self.x), np.full_like(self.x, 1e6)]
+            self.t = t
+            return self.x
+        dt = t - self.t
+        if dt <= 0:
+            return self.x
+        self.t = t
+
+        # Predict
+        pp, pv, vv = self.p
+        self.x += self.v * dt
+        q = self.q
+        pp = pp + dt * (2 * pv + dt * vv) + q * dt ** 4 / 4
+        pv = pv + dt * vv + q * dt ** 3 / 2
+        vv = vv + q * dt ** 2
+
+        # Update with the measured position
+        s = pp + self.r
+        kx, kv = pp / s, pv / s
+        residual = x - self.x
+        self.x += kx * residual
+        self.v += kv * residual
+        self.p = [(1 - kx) * pp, (1 - kx) * pv, vv - kv * pv]
+        return self.x
+
+
+FILTERS = {"one_euro": OneEuroFilter, "kalman": KalmanFilter}
+
+
+# Smooths the landmarks of every hand between findHands and the gesture stage.
+# Hands are told apart by handedness; a hand missing from a frame loses its
+# filter. The hand dicts are copied, never changed in place, so the trace
+# recorder and the detector's own state keep the raw landmarks.
+class LandmarkSmoother():
+    def __init__(self, make_filter=OneEuroFilter):
+        self.make_filter = make_filter
+        self.filters = {}  # Handedness (or index) -> filter
+        self.resets = 0    # Filters dropped because their hand was lost
+
+    def update(self, hands, frame_time):
+        if not hands:
+            self.resets += len(self.filters)
+            self.filters.clear()
+            return hands
+        smoothed = []
+        seen = set()
+        for i, hand in enumerate(hands):
+            hand_id = hand.get("type", i)
+            if hand_id in seen:
+                hand_id = i  # Two hands of the same type, told apart by position in the list
+            seen.add(hand_id)
+            f = self.filters.get(hand_id)
+            if f is None:
+                f = self.filters[hand_id] = self.make_filter()
+            lm = f(np.asarray(hand["lmList"], np.float64), frame_time)
+            hand = dict(hand)
+            hand["lmList"] = np.rint(lm).astype(np.int32).tolist()
+            smoothed.append(hand)
+        for hand_id in [h for h in self.filters if h not in seen]:
+            del self.filters[hand_id]
+            self.resets += 1
+        return smoothed
+
+
+# The configured smoother, or None for raw landmarks
+def create_smoother(kind):
+    if not kind:
+        return None
+    return LandmarkSmoother(FILTERS[kind])
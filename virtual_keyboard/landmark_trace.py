@@ -0,0 +1,179 @@
+import json
+import os
+
+import numpy as np
+
+# Binary session traces: what the detector saw on every frame plus the pinch
+# and hover state derived from it, without storing any video. A trace is a
+# directory of fixed-size chunks (chunk_00000.npy, ...), each a preallocated
+# memory-mapped structured array, and an index.json with the record count of
+# every chunk. Appending a frame is a handful of array stores into the mapped
+# chunk; readers map the chunks read-only and only touch the pages they use.
+
+MAX_HANDS = 2
+HANDEDNESS = {"Left": 0, "Right": 1}
+HANDEDNESS_NAMES = {0: "Left", 1: "Right"}
+
+TRACE_DTYPE = np.dtype([
+    ("seq", np.uint32),                      # Frame number from 1; 0 marks an unwritten record
+    ("timestamp", np.float64),               # Capture time of the frame
+    ("hand_count", np.uint8),
+    ("handedness", np.int8, (MAX_HANDS,)),   # 0 left, 1 right, -1 no hand
+    ("lm", np.int16, (MAX_HANDS, 21, 3)),    # lmList of each hand
+    ("bbox", np.int16, (MAX_HANDS, 4)),      # x, y, w, h
+    ("pinching", np.bool_),
+    ("pinch_ms", np.uint16),                 # Milliseconds the pinch has been held so far
+    ("hover", np.int16),                     # Key under the index fingertip, -1 for none
+    ("pressed", np.int16),                   # Key committed on this frame, -1 for none
+])
+
+
+def _chunk_path(path, index):
+    return os.path.join(path, f"chunk_{index:05d}.npy")
+
+
+# Appends one record per frame: add() right after findHands, then set_state()
+# once the pinch and hover logic has run
+class LandmarkTraceWriter():
+    def __init__(self, path, chunk_size=65536):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size   # Records per chunk, about 18 MB at the default
+        self.counts = []               # Records in every finished chunk
+        self.chunk = None
+        self.row = chunk_size          # Next free row in the current chunk
+        self.seq = 0
+
+    def _next_chunk(self):
+        if self.chunk is not None:
+            self.chunk.flush()
+            self.counts.append(self.row)
+        self.chunk = np.lib.format.open_memmap(_chunk_path(self.path, len(self.counts)), mode="w+",
+                                               dtype=TRACE_DTYPE, shape=(self.chunk_size,))
+        # Plain ndarray column views, so an append is a few array stores
+        # (slicing the np.memmap subclass itself costs more than the stores)
+        self.columns = {name: np.asarray(self.chunk[name]) for name in TRACE_DTYPE.names}
+        self.row = 0
+        self._write_index(self.counts)
+
+    # Only finished chunks are indexed while recording; readers count the rows
+    # of an unindexed chunk from its seq column
+    def _write_index(self, counts):
+        with open(os.path.join(self.path, "index.json"), "w") as f:
+            json.dump({"chunk_size": self.chunk_size, "counts": counts}, f)
+
+    def add(self, timestamp, hands):
+        if self.row == self.chunk_size:
+            self._next_chunk()
+        c, row = self.columns, self.row
+        self.seq += 1
+        c["seq"][row] = self.seq
+        c["timestamp"][row] = timestamp
+        n = min(len(hands), MAX_HANDS)
+        c["hand_count"][row] = n
+        c["handedness"][row] = -1
+        for i in range(n):
+            hand = hands[i]
+            lm = hand["lmList"]
+            c["lm"][row, i, :len(lm), :len(lm[0])] = lm
+            c["bbox"][row, i] = hand["bbox"]
+            c["handedness"][row, i] = HANDEDNESS.get(hand.get("type"), -1)
+        c["hover"][row] = -1
+        c["pressed"][row] = -1
+        self.row += 1
+
+    # Pinch and hover state of the frame added last
+    def set_state(self, pinching, pinch_held, hover=-1, pressed=-1):
+        c, row = self.columns, self.row - 1
+        c["pinching"][row] = pinching
+        c["pinch_ms"][row] = min(int(pinch_held * 1000), 0xFFFF)
+        c["hover"][row] = hover
+        c["pressed"][row] = pressed
+
+    def __len__(self):
+        return sum(self.counts) + (self.row if self.chunk is not None else 0)
+
+    def close(self):
+        if self.chunk is not None:
+            self.chunk.flush()
+            self._write_index(self.counts + [self.row])
+            del self.columns
+            self.chunk = None
+
+
+# Streams or slices a trace without loading it: every chunk is mapped
+# read-only and only the rows asked for are read from disk
+class LandmarkTraceReader():
+    def __init__(self, path):
+        self.path = path
+        index_path = os.path.join(path, "index.json")
+        counts = None
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                counts = json.load(f)["counts"]
+
+        self.chunks = []
+        i = 0
+        while os.path.exists(_chunk_path(path, i)):
+            chunk = np.load(_chunk_path(path, i), mmap_mode="r")
+            if counts is not None and i < len(counts):
+                count = counts[i]
+            else:
+                # Not indexed (the writer didn't close): trust the seq column
+                written = np.flatnonzero(chunk["seq"])
+                count = int(written[-1]) + 1 if len(written) else 0
+            self.chunks.append(chunk[:count])
+            i += 1
+        self.offsets = np.cumsum([0] + [len(chunk) for chunk in self.chunks])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    # Records chunk by chunk as read-only mapped arrays
+    def iter_chunks(self):
+        for chunk in self.chunks:
+            if len(chunk):
+                yield chunk
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Any step, negative too: the slice picks record numbers, which
+            # are then gathered chunk by chunk
+            rows = np.arange(len(self))[index]
+            chunks = np.searchsorted(self.offsets, rows, side="right") - 1
+            records = np.empty(len(rows), TRACE_DTYPE)
+            for chunk in np.unique(chunks):
+                picked = chunks == chunk
+                records[picked] = self.chunks[chunk][rows[picked] - self.offsets[chunk]]
+            return records
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"record {index} out of range")
+        chunk = int(np.searchsorted(self.offsets, index, side="right")) - 1
+        return self.chunks[chunk][index - self.offsets[chunk]]
+
+    # Records with t0 <= timestamp < t1, assuming timestamps increase
+    def between(self, t0, t1):
+        parts = []
+        for chunk in self.iter_chunks():
+            lo, hi = np.searchsorted(chunk["timestamp"], [t0, t1])
+            if lo < hi:
+                parts.append(chunk[lo:hi])
+        return np.concatenate(parts) if parts else np.empty(0, TRACE_DTYPE)
+
+
+# The cvzone-style hand dicts stored in one record
+def record_hands(record):
+    hands = []
+    for i in range(int(record["hand_count"])):
+        x, y, w, h = (int(v) for v in record["bbox"][i])
+        hands.append({"lmList": record["lm"][i].tolist(),
+                      "bbox": (x, y, w, h),
+                      "center": (x + w // 2, y + h // 2),
+                      "type": HANDEDNESS_NAMES.get(int(record["handedness"][i]), "Unknown")})
+    return hands
@@ -0,0 +1,98 @@
+import json
+from collections import deque
+
+import numpy as np
+
+# Edges of the end-to-end latency histogram in milliseconds
+LATENCY_BINS_MS = np.concatenate([np.arange(0, 500, 25), np.arange(500, 2001, 100)])
+
+
+# One committed keystroke. Times are on the loop clock, in seconds:
+#   onset     capture time of the frame where the pinch first closed
+#   frame     capture time of the frame the key was committed from
+#   commit    when the loop committed the key
+#   injected  when keyboard.type / press returned on the output worker
+class Keystroke():
+    __slots__ = ("key", "onset", "frame", "commit", "injected")
+
+    def __init__(self, key, onset, frame, commit):
+        self.key = key
+        self.onset = onset
+        self.frame = frame
+        self.commit = commit
+        self.injected = None
+
+    # Called by the output worker with the seconds from submit() to injection
+    # complete. Taking a duration rather than a timestamp keeps the record on
+    # the loop clock, which in a headless replay is the recording's clock.
+    def done(self, output_seconds):
+        self.injected = self.commit + output_seconds
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Collects keystroke timings and turns them into a histogram of pinch-onset
+# to injection-complete latency, which can be exported and compared between
+# builds (benchmarks/compare_latency.py). Only the last `history` keystrokes
+# are kept, so a long session doesn't grow without bound.
+class LatencyTracker():
+    def __init__(self, bins_ms=LATENCY_BINS_MS, history=4096):
+        self.bins_ms = np.asarray(bins_ms, np.float64)
+        self.keystrokes = deque(maxlen=history)  # Most recent keystrokes
+        self.committed = 0                       # Keystrokes committed over the whole session
+
+    def commit(self, key, onset, frame, commit):
+        stroke = Keystroke(key, onset if onset is not None else frame, frame, commit)
+        self.keystrokes.append(stroke)
+        self.committed += 1
+        return stroke
+
+    def _completed(self):
+        return [s for s in self.keystrokes if s.injected is not None]
+
+    # Milliseconds per segment for every injected keystroke
+    def segments(self):
+        done = self._completed()
+        onset = np.array([s.onset for s in done])
+        frame = np.array([s.frame for s in done])
+        commit = np.array([s.commit for s in done])
+        injected = np.array([s.injected for s in done])
+        return {"hold": (frame - onset) * 1000,         # Pinch onset to the committing frame
+                "loop": (commit - frame) * 1000,         # Capture of that frame to commit
+                "output": (injected - commit) * 1000,    # Queue and key injection
+                "total": (injected - onset) * 1000}
+
+    def histogram(self):
+        counts, _ = np.histogram(self.segments()["total"], bins=self.bins_ms)
+        return counts
+
+    def summary(self):
+        result = {}
+        for name, ms in self.segments().items():
+            if len(ms):
+                p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+                result[name] = {"mean_ms": float(ms.mean()), "p50_ms": float(p50),
+                                "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(ms.max())}
+        return result
+
+    def report(self):
+        summary = self.summary()
+        if not summary:
+            return [f"Keystroke latency: no keystrokes injected ({self.committed} committed)"]
+        recent = ("" if self.committed == len(self.keystrokes)
+                  else f", last {len(self.keystrokes)} of {self.committed} committed")
+        lines = [f"Keystroke latency over {len(self._completed())} keys (pinch onset to injection{recent}):"]
+        for name, s in summary.items():
+            lines.append(f"  {name:<7} p50 {s['p50_ms']:7.1f} ms  p95 {s['p95_ms']:7.1f} ms  "
+                         f"max {s['max_ms']:7.1f} ms")
+        return lines
+
+    def export(self, path, label=None):
+        data = {"label": label,
+                "bins_ms": self.bins_ms.tolist(),
+                "counts": self.histogram().tolist(),
+                "summary": self.summary(),
+                "keystrokes": [s.as_dict() for s in self.keystrokes]}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
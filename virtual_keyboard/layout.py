@@ -0,0 +1,142 @@
+from .config import FRAME_SIZE
+from .hit_test import ButtonMap
+
+# Keyboard layouts and the hit-test stage. A layout is a list of Keys in
+# screen coordinates; how a key looks is up to the renderer.
+
+
+# One virtual key
+class Key():
+    def __init__(self, pos, text, size=[85, 85]):
+        self.pos = pos
+        self.size = size
+        self.text = text
+        self.id = -1  # Index into the ButtonMap state arrays
+
+
+# Keyboard Layout - Improved, straight layout with all necessary keys
+STRAIGHT_KEYS = [["1", "2", "3", "4", "5", "6", "7", "8", "9", "0", "⌫"],
+                 ["Q", "W", "E", "R", "T", "Y", "U", "I", "O", "P", "'"],
+                 ["A", "S", "D", "F", "G", "H", "J", "K", "L", ";",],
+                 ["Z", "X", "C", "V", "B", "N", "M", ",", ".", "/", ],
+                 ["SPACE",]]  # Complete keyboard layout with function keys
+
+
+# Create Buttons - improved layout with more consistency and proper spacing
+def straight_layout(keys=STRAIGHT_KEYS):
+    buttonList = []
+    for i in range(len(keys)):
+        for j, key in enumerate(keys[i]):
+            # Base position calculations - ensure straight and consistent alignment
+            x_pos = 100 * j + 50
+            y_pos = 100 * i + 50
+
+            # Create a straight keyboard layout with consistent spacing
+            if key == "⌫":
+                # Make backspace key wider and more visible
+                buttonList.append(Key([x_pos, y_pos], key, size=[120, 85]))
+            elif key == "⏎":
+                # Make enter key wider and more visible
+                buttonList.append(Key([x_pos, y_pos], key, size=[120, 85]))
+            elif key == "SPACE":
+                # Make spacebar wider and position it centrally
+                buttonList.append(Key([250, y_pos], key, size=[450, 85]))
+            elif key == "←" or key == "↑" or key == "→" or key == "↓":
+                # Arrow keys
+                buttonList.append(Key([x_pos, y_pos], key, size=[90, 85]))
+            elif key == "CTRL" or key == "ALT":
+                # Add function keys with appropriate size
+                buttonList.append(Key([x_pos, y_pos], key, size=[150, 85]))
+            else:
+                # Standard sized keys with consistent spacing
+                buttonList.append(Key([x_pos, y_pos], key, size=[90, 85]))
+    return buttonList
+
+
+# Modern Keyboard Layout with improved aesthetics
+ERGONOMIC_KEYS = [["1", "2", "3", "4", "5", "6", "7", "8", "9", "0", "⌫"],
+                  ["Q", "W", "E", "R", "T", "Y", "U", "I", "O", "P", "⏎"],
+                  ["A", "S", "D", "F", "G", "H", "J", "K", "L", ";"],
+                  ["Z", "X", "C", "V", "B", "N", "M", ",", ".", "/"],
+                  ["CTRL", "ALT", "SPACE", "←", "↑", "↓", "→"]]
+
+
+# Create a curved/ergonomic keyboard layout
+# Each row will have a slight arc for a more natural finger position
+def ergonomic_layout(keys=ERGONOMIC_KEYS, width=FRAME_SIZE[0]):
+    buttonList = []
+    row_offsets = [15, 30, 45, 35, 0]  # Pixel offsets for each row
+    row_heights = [50, 150, 250, 350, 450]  # Y positions
+
+    for i in range(len(keys)):
+        row_offset = row_offsets[i]  # Get offset for this row
+        y_pos = row_heights[i]
+
+        # Calculate key width based on available space and number of keys in row
+        total_keys = len(keys[i])
+        key_width = 90  # Default key width
+        key_spacing = 10  # Space between keys
+
+        # Calculate starting position to center the row
+        if i == 4:  # Special row with spacebar
+            # Calculate widths for each key in bottom row
+            widths = []
+            for key in keys[i]:
+                if key == "SPACE":
+                    widths.append(400)  # Spacebar width
+                elif key == "CTRL" or key == "ALT":
+                    widths.append(120)  # Function key width
+                else:
+                    widths.append(90)  # Arrow key width
+
+            # Calculate total row width
+            total_row_width = sum(widths) + ((len(widths)-1) * key_spacing)
+
+            # Place each key, starting so the row is centred
+            x_pos = (width - total_row_width) // 2
+            for k, key in enumerate(keys[i]):
+                buttonList.append(Key([x_pos, y_pos], key, size=[widths[k], 90]))
+                x_pos += widths[k] + key_spacing
+        else:
+            # Center the row horizontally for normal rows
+            total_row_width = (total_keys * key_width) + ((total_keys-1) * key_spacing)
+            x_start = (width - total_row_width) // 2 + row_offset
+
+            # Create keys for this row
+            for j, key in enumerate(keys[i]):
+                x_pos = x_start + (j * (key_width + key_spacing))
+
+                if key == "⌫" or key == "⏎":
+                    # Backspace and enter - larger and distinctive
+                    buttonList.append(Key([x_pos-10, y_pos], key, size=[130, 95]))
+                else:
+                    # Standard keys with consistent modern look
+                    buttonList.append(Key([x_pos, y_pos], key, size=[95, 95]))
+    return buttonList
+
+
+LAYOUTS = {"straight": straight_layout, "ergonomic": ergonomic_layout}
+
+
+# Hit-test stage: fingertip-to-key lookup through the ButtonMap label image,
+# plus the per-key hover and press state. Cooldowns are the gesture engine's
+class Keyboard():
+    def __init__(self, keys, shape=FRAME_SIZE[::-1]):
+        self.keys = keys
+        self.buttonMap = ButtonMap(keys, shape)
+
+    # Index of the key under (x, y), or -1; counts hover frames
+    def hit_test(self, x, y):
+        hit = self.buttonMap.lookup(x, y)
+        self.buttonMap.update_hover(hit)
+        return hit
+
+    # Index of the key under (x, y), or -1, leaving the hover state alone
+    def lookup(self, x, y):
+        return self.buttonMap.lookup(x, y)
+
+    def press(self, index):
+        self.buttonMap.press(index)
+
+    def reset_pressed(self):
+        self.buttonMap.reset_pressed()
@@ -0,0 +1,86 @@
+import cv2
+import numpy as np
+
+PIXEL = np.dtype((np.void, 3))  # One BGR pixel as a single item
+
+
+# Pixel offsets of a filled cv2.circle of the given radius
+def disk_offsets(radius):
+    size = 2 * radius + 3
+    stamp = np.zeros((size, size), np.uint8)
+    cv2.circle(stamp, (radius + 1, radius + 1), radius, 255, cv2.FILLED)
+    dy, dx = np.nonzero(stamp)
+    return dy - radius - 1, dx - radius - 1
+
+
+# Press particles as a struct of arrays with a fixed budget. Every particle
+# lives in a slot of preallocated position/velocity/lifetime/colour arrays;
+# update() steps all of them at once and draw() writes the disks straight into
+# the image with one fancy-indexed store. Dead slots are reused by the next
+# burst, and when the budget is exhausted the particles closest to dying make
+# room for the new ones.
+class ParticleSystem():
+    def __init__(self, max_particles=400, radius=2, rng=None):
+        self.max_particles = max_particles
+        self.rng = rng or np.random.default_rng()
+        self.x = np.zeros(max_particles, np.int32)
+        self.y = np.zeros(max_particles, np.int32)
+        self.vx = np.zeros(max_particles, np.int32)
+        self.vy = np.zeros(max_particles, np.int32)
+        self.life = np.zeros(max_particles, np.int32)   # Frames left; 0 is a free slot
+        self.color = np.zeros((max_particles, 3), np.uint8)
+        self.dy, self.dx = disk_offsets(radius)
+        self.radius = radius
+
+    def __len__(self):
+        return int(np.count_nonzero(self.life))
+
+    # Spawn count particles at (x, y): speeds -5..5 sideways and -5..-1 upwards,
+    # living 10 to 29 frames
+    def emit(self, x, y, color, count=20):
+        count = min(count, self.max_particles)
+        free = np.flatnonzero(self.life == 0)[:count]
+        if len(free) < count:
+            busy = np.flatnonzero(self.life)
+            oldest = busy[np.argpartition(self.life[busy], count - len(free) - 1)[:count - len(free)]]
+            free = np.concatenate([free, oldest])
+        self.x[free] = x
+        self.y[free] = y
+        self.vx[free] = self.rng.integers(-5, 6, count)
+        self.vy[free] = self.rng.integers(-5, 0, count)
+        self.life[free] = self.rng.integers(10, 30, count)
+        self.color[free] = color
+
+    # Move every live particle one step and retire the ones that ran out
+    def update(self):
+        live = self.life > 0
+        self.x += self.vx * live
+        self.y += self.vy * live
+        self.life -= live
+
+    def draw(self, img):
+        live = np.flatnonzero(self.life)
+        if len(live) == 0:
+            return img
+        h, w = img.shape[:2]
+        ys = self.y[live, None] + self.dy
+        xs = self.x[live, None] + self.dx
+        # Colours as whole 3-byte pixels: one store per pixel instead of three
+        colors = np.broadcast_to(self.color[live].view(PIXEL), ys.shape)
+        inside = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+        if not inside.all():
+            ys, xs, colors = ys[inside], xs[inside], colors[inside]
+        if img.flags.c_contiguous:
+            img.reshape(-1).view(PIXEL)[(ys * w + xs).ravel()] = colors.ravel()
+        else:
+            img[ys, xs] = colors.view(np.uint8).reshape(colors.shape + (3,))
+        return img
+
+    # (x0, y0, x1, y1) covering every live particle, or None
+    def bounds(self):
+        live = np.flatnonzero(self.life)
+        if len(live) == 0:
+            return None
+        r = self.radius
+        return (int(self.x[live].min()) - r, int(self.y[live].min()) - r,
+                int(self.x[live].max()) + r + 1, int(self.y[live].max()) + r + 1)
@@ -0,0 +1,184 @@
+import csv
+import json
+import os
+from time import perf_counter, perf_counter_ns
+
+import cv2
+import numpy as np
+
+from .text_sprites import put_text
+
+
+# Per-stage timing of the frame loop. The loop calls start() at the top of a
+# frame, mark(stage) after every stage and end() once the frame is out; each
+# mark adds the nanoseconds since the previous one to that stage, and end()
+# stores every stage that ran in its own fixed-size ring buffer. Stages that
+# don't run on a frame (no key pressed, no hand) simply aren't marked, and a
+# stage marked twice in one frame gets the sum. A frame only counts once it
+# reaches end(): a start() without one (the capture had no frame) is dropped
+# by the next start().
+#
+# Disabled, start(), mark() and end() return straight away, so the calls can
+# stay in the loop permanently. The HUD and the periodic dump read the rings,
+# the HUD recomputing its percentiles at most every refresh seconds.
+class StageTimer():
+    def __init__(self, stages, size=512, enabled=True, dump_path=None, dump_interval=10.0,
+                 refresh=0.5, clock=perf_counter_ns):
+        self.stages = list(stages)
+        self.index = {stage: i for i, stage in enumerate(self.stages)}
+        self.size = size
+        self.enabled = enabled
+        self.show_hud = False
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.refresh = refresh
+        self.clock = clock
+
+        self.samples = np.zeros((len(self.stages), size), np.int64)
+        self.counts = np.zeros(len(self.stages), np.int64)   # Samples ever recorded per stage
+        self.frame_starts = np.zeros(size, np.int64)
+        self.frames = 0
+        self.current = [0] * len(self.stages)   # This frame's time per stage
+        self.marked = [False] * len(self.stages)
+        self.last = 0
+        self.started = 0    # Clock at this frame's start()
+        self.cached = None
+        self.cached_at = -np.inf
+        self.dumped_at = perf_counter()
+
+    def start(self):
+        if not self.enabled:
+            return
+        self.last = self.started = self.clock()
+
+    def mark(self, stage):
+        if not self.enabled:
+            return
+        now = self.clock()
+        i = self.index[stage]
+        self.current[i] += now - self.last
+        self.marked[i] = True
+        self.last = now
+
+    def end(self):
+        if not self.enabled:
+            return
+        self.frame_starts[self.frames % self.size] = self.started
+        self.frames += 1
+        for i, marked in enumerate(self.marked):
+            if marked:
+                self.samples[i, self.counts[i] % self.size] = self.current[i]
+                self.counts[i] += 1
+                self.current[i] = 0
+                self.marked[i] = False
+
+    def toggle_hud(self):
+        self.show_hud = not self.show_hud
+
+    def fps(self):
+        n = min(self.frames, self.size)
+        if n < 2:
+            return 0.0
+        starts = self.frame_starts[:n] if self.frames <= self.size else self.frame_starts
+        span = starts.max() - starts.min()
+        return (n - 1) * 1e9 / span if span > 0 else 0.0
+
+    # {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} over each stage's ring
+    def summary(self):
+        result = {}
+        for stage, i in self.index.items():
+            n = int(min(self.counts[i], self.size))
+            if n == 0:
+                continue
+            ms = self.samples[i, :n] / 1e6
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            result[stage] = {"count": int(self.counts[i]), "mean_ms": float(ms.mean()),
+                             "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+        return result
+
+    def _cached_summary(self):
+        now = perf_counter()
+        if now - self.cached_at >= self.refresh:
+            self.cached = (self.fps(), self.summary())
+            self.cached_at = now
+        return self.cached
+
+    def report(self):
+        lines = [f"Frame loop: {self.fps():.1f} FPS over the last {min(self.frames, self.size)} frames"]
+        for stage, s in self.summary().items():
+            lines.append(f"  {stage:<10} p50 {s['p50_ms']:6.2f} ms  p95 {s['p95_ms']:6.2f} ms  "
+                         f"p99 {s['p99_ms']:6.2f} ms")
+        return lines
+
+    # Overlay with the FPS and per-stage percentiles; returns the (x0, y0, x1, y1) it covered
+    def draw_hud(self, img, x=960, y=700):
+        if not (self.enabled and self.show_hud):
+            return None
+        fps, summary = self._cached_summary()
+        lines = [f"{fps:5.1f} FPS        p50    p95    p99"]
+        lines += [f"{stage:<10} {s['p50_ms']:6.2f} {s['p95_ms']:6.2f} {s['p99_ms']:6.2f}"
+                  for stage, s in summary.items()]
+        line_h = 16
+        y0 = y - line_h * len(lines) - 8
+        x1 = x + 300
+        background = (20, 20, 20)
+        cv2.rectangle(img, (x, y0), (x1, y), background, cv2.FILLED)
+        # The lines only change when the numbers are refreshed, so they come from the sprite cache
+        for k, line in enumerate(lines):
+            put_text(img, line, (x + 6, y0 + 18 + k * line_h), cv2.FONT_HERSHEY_PLAIN, 1,
+                     (255, 255, 255), 1, background=background)
+        return (x, y0, x1 + 1, y + 1)
+
+    # Writes the summary to dump_path every dump_interval seconds
+    def maybe_dump(self):
+        if self.enabled and self.dump_path and perf_counter() - self.dumped_at >= self.dump_interval:
+            self.dump()
+
+    # CSV files get one row per stage appended on every dump; JSON files are
+    # rewritten with the latest summary
+    def dump(self, path=None):
+        path = path or self.dump_path
+        self.dumped_at = perf_counter()
+        summary = self.summary()
+        fps = self.fps()
+        if path.endswith(".csv"):
+            new = not os.path.exists(path)
+            with open(path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if new:
+                    writer.writerow(["frames", "fps", "stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+                for stage, s in summary.items():
+                    writer.writerow([self.frames, f"{fps:.2f}", stage, s["count"], f"{s['mean_ms']:.4f}",
+                                     f"{s['p50_ms']:.4f}", f"{s['p95_ms']:.4f}", f"{s['p99_ms']:.4f}"])
+        else:
+            with open(path, "w") as f:
+                json.dump({"frames": self.frames, "fps": fps, "stages": summary}, f, indent=2)
+
+
+# Startup milestones in wall-clock seconds from start (the package import,
+# see __init__.py): stages built, first window shown, camera open, first
+# camera frame shown, hand model loaded, first frame with a hand found. Each
+# is recorded once. Milestones reached on another thread are marked with the
+# clock time they were reached at.
+class StartupTimer():
+    EVENTS = {"setup": "stages built", "ui": "window", "camera_open": "camera open",
+              "first_frame": "first frame", "model_ready": "model ready", "first_hand": "first hand"}
+
+    def __init__(self, start, clock=perf_counter):
+        self.start = start
+        self.clock = clock
+        self.times = {}  # Event -> seconds after start
+
+    def mark(self, event, at=None):
+        if event not in self.times:
+            self.times[event] = (self.clock() if at is None else at) - self.start
+
+    def report(self):
+        if not self.times:
+            return []
+        return ["Startup: " + ", ".join(f"{self.EVENTS[event]} {seconds:.2f} s"
+                                        for event, seconds in sorted(self.times.items(), key=lambda e: e[1]))]
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.times, f, indent=2)
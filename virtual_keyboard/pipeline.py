@@ -0,0 +1,239 @@
+from time import time
+
+import cv2
+
+from . import LAUNCHED
+from .config import FRAME_SIZE, LIGHT_TEXT, PERF_DUMP, PERF_DUMP_INTERVAL, PERF_STATS
+from .frame_arena import FrameArena
+from .gesture_engine import COMMITTED, COOLDOWN, INITIAL, GestureEngine
+from .hand_tracking import close_detector, detector_live, detector_ready_at, detector_report
+from .latency import LatencyTracker
+from .perf_stats import StageTimer, StartupTimer
+from .stages import FrameState
+
+# Frame loop stages timed by the StageTimer
+STAGES = ["capture", "flip", "detect", "gesture", "hit_test", "output", "render", "hud", "display"]
+
+
+# The keyboard frame loop: Capture -> Detect -> Gesture -> Layout/HitTest ->
+# Render -> Output, one stage object each (see stages.py). Swapping a stage
+# for another implementation changes nothing else, which is how the
+# keyboard runs headless (headless.py) and how stages are benchmarked
+# against each other.
+class Pipeline():
+    def __init__(self, capture, detector, gesture, keyboard, renderer, output, text, display=cv2,
+                 clock=time, recorder=None, perf=None, latency=None, draw_landmarks=False,
+                 latency_export=None, startup=None, startup_export=None, engine=None, smoother=None,
+                 predictor=None):
+        self.capture = capture
+        self.detector = detector
+        self.gesture = gesture
+        if engine is None:
+            engine = GestureEngine()
+        self.engine = engine      # Hold and cooldown state machine
+        self.pinch = INITIAL      # Its state after the last frame
+        self.keyboard = keyboard
+        self.renderer = renderer
+        self.output = output
+        self.text = text          # Typed text
+        self.display = display
+        self.clock = clock
+        self.recorder = recorder  # Landmark trace writer, or None
+        self.smoother = smoother  # Landmark filter between detection and gesture, or None
+        self.predictor = predictor  # Fingertip predictor for hit-testing, or None
+        if perf is None:
+            perf = StageTimer(STAGES, enabled=PERF_STATS, dump_path=PERF_DUMP, dump_interval=PERF_DUMP_INTERVAL)
+        self.perf = perf
+        if latency is None:
+            latency = LatencyTracker()  # Pinch onset to injected keystroke, per key
+        self.latency = latency
+        self.draw_landmarks = draw_landmarks
+        self.latency_export = latency_export
+        self.arena = FrameArena()  # Flipped frame buffer, reused every frame
+        self.frames = 0            # Camera frames shown
+        if startup is None:
+            startup = StartupTimer(LAUNCHED)
+        self.startup = startup
+        self.startup_export = startup_export
+        self.startup.mark("setup")
+
+    # Startup notice along the bottom edge, under the text box
+    def _notice(self, img, text):
+        org = (50, FRAME_SIZE[1] - 12)
+        cv2.putText(img, text, org, cv2.FONT_HERSHEY_PLAIN, 1.5, LIGHT_TEXT, 2)
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_PLAIN, 1.5, 2)
+        self.renderer.mark((org[0] - 2, org[1] - h - 2, org[0] + w + 2, org[1] + baseline + 2))
+
+    # Until the camera delivers its first frame the keyboard is shown over a
+    # blank one, so the window is up and answering keys straight away
+    def _show_waiting(self):
+        blank = self.arena.filled("waiting", (FRAME_SIZE[1], FRAME_SIZE[0], 3), (0, 0, 0))
+        img = self.renderer.render(FrameState(blank, [], self.gesture))
+        self._notice(img, "Starting camera...")
+        self.display.imshow(self.renderer.title, img)
+        self.startup.mark("ui")
+        self._mark_ready()
+        return self.display.waitKey(1) & 0xFF
+
+    # Camera open and model loaded, at the times the capture and detector
+    # threads reached them
+    def _mark_ready(self):
+        opened_at = getattr(self.capture, "opened_at", None)
+        if opened_at is not None:
+            self.startup.mark("camera_open", opened_at)
+        ready_at = detector_ready_at(self.detector)
+        if ready_at is not None:
+            self.startup.mark("model_ready", ready_at)
+
+    # One frame through every stage. Returns the key code pressed in the
+    # window, or None when the capture has run out
+    def step(self):
+        perf = self.perf
+        gesture = self.gesture
+        keyboard = self.keyboard
+
+        perf.start()
+        # Get image from camera
+        success, img = self.capture.read()
+        if not success:
+            if getattr(self.capture, "finished", False):
+                error = getattr(self.capture, "error", None)
+                if error:
+                    print(error)  # Camera could not be opened
+                return None  # Camera closed or end of a recorded video
+            if self.frames == 0:
+                return self._show_waiting()
+            print("Failed to grab frame")
+            return -1
+
+        frame_time = getattr(self.capture, "last_timestamp", self.clock())  # Capture time of this frame
+        perf.mark("capture")
+
+        # Flip the image horizontally for a more natural interaction
+        img = self.arena.flip(img, 1)
+        perf.mark("flip")
+
+        # Find hands - landmarks come back in screen coordinates
+        hands, img = self.detector.findHands(img, draw=self.draw_landmarks)
+        if self.recorder is not None:
+            self.recorder.add(frame_time, hands)
+        live = detector_live(self.detector)  # False while the model is still loading
+        perf.mark("detect")
+
+        # Smoothing counts towards the gesture stage; the trace keeps the raw landmarks
+        if self.smoother is not None:
+            hands = self.smoother.update(hands, frame_time)
+        gesture.update(hands, frame_time)
+        state = FrameState(img, hands, gesture)
+        keyboard.reset_pressed()
+        perf.mark("gesture")
+
+        # Check for button interaction with index finger
+        target = -1  # Key the pinch can type
+        if hands:
+            index_tip = gesture.index_tip
+            if self.predictor is None:
+                state.hit = target = keyboard.hit_test(index_tip[0], index_tip[1])
+            else:
+                # Hover follows the predicted tip; a key is only typed where
+                # the observed tip agrees
+                x, y = self.predictor.update(index_tip, frame_time, self.clock())
+                state.hit = keyboard.hit_test(x, y)
+                if state.hit == keyboard.lookup(index_tip[0], index_tip[1]):
+                    target = state.hit
+        elif self.predictor is not None:
+            self.predictor.reset()
+        # Without a hand the pinch is carried over, like a brief detector dropout
+        self.pinch = pinch = self.engine.step(self.pinch, frame_time, target, gesture.trigger)
+        state.hold_fraction = self.engine.hold_fraction(pinch, frame_time)
+        if pinch.phase is COOLDOWN:
+            state.in_cooldown = True
+            state.cooldown_fraction = self.engine.cooldown_fraction(pinch, frame_time)
+
+        # Pinch held long enough over a key that is not cooling down
+        elif pinch.phase is COMMITTED:
+            keyboard.press(target)
+            state.pressed = target
+            key = keyboard.keys[target].text
+
+            # Key injection runs on the output worker thread
+            perf.mark("hit_test")
+            self.output.submit(key, self.latency.commit(key, pinch.onset, frame_time, self.clock()))
+
+            # Update display text regardless of typing success
+            self.text.type_key(key)
+            perf.mark("output")
+        if pinch.phase is not COMMITTED:
+            perf.mark("hit_test")
+
+        img = self.renderer.render(state)
+        perf.mark("render")
+
+        # Pinch and hover state of this frame for the landmark trace
+        if self.recorder is not None:
+            held = frame_time - pinch.onset if pinch.onset is not None else 0.0
+            self.recorder.set_state(bool(hands) and bool(gesture.is_pinching), held, state.hit, state.pressed)
+
+        if not live:
+            self._notice(img, "Loading hand tracking...")
+
+        # Performance overlay
+        hud = perf.draw_hud(img)
+        if hud:
+            self.renderer.mark(hud)
+        perf.mark("hud")
+
+        self.display.imshow(self.renderer.title, img)
+        self.frames += 1
+        self.startup.mark("ui")
+        self.startup.mark("first_frame")
+        self._mark_ready()
+        if hands:
+            self.startup.mark("first_hand")
+        key = self.display.waitKey(1) & 0xFF
+        perf.mark("display")
+        perf.end()
+        perf.maybe_dump()
+        return key
+
+    # Main Loop - runs until 'q' is pressed or the capture runs out, then
+    # releases everything (on an error or Ctrl-C too) and returns the typed text
+    def run(self):
+        try:
+            while True:
+                key = self.step()
+                if key is None:
+                    break
+                # 'p' toggles the performance overlay
+                if key == ord('p'):
+                    self.perf.toggle_hud()
+                if key == ord('q'):
+                    break
+        finally:
+            self.close()
+        return str(self.text)
+
+    # Release resources
+    def close(self):
+        self.output.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        # Capture and output stages that keep counters (the threaded ones) report them too
+        stage_reports = [stage.report() for stage in (self.capture, self.output) if hasattr(stage, "report")]
+        reports = self.startup.report() + sum(stage_reports, []) + detector_report(self.detector) + self.perf.report()
+        for line in reports:
+            print(line)
+        if self.predictor is not None:
+            for line in self.predictor.report():
+                print(line)
+        close_detector(self.detector)
+        if self.perf.dump_path:
+            self.perf.dump()
+        for line in self.latency.report():
+            print(line)
+        if self.latency_export:
+            self.latency.export(self.latency_export)
+        if self.startup_export:
+            self.startup.dump(self.startup_export)
+        self.capture.release()
+        self.display.destroyAllWindows()
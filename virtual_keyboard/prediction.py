@@ -0,0 +1,87 @@
+from collections import deque
+from math import hypot
+
+import numpy as np
+
+from .config import PREDICTION_MAX_MS
+
+# Fingertip prediction for hit-testing. The index tip the loop hit-tests is
+# where the finger was when the frame was captured; by the time detection is
+# done the finger has moved on, and during a fast sweep the highlighted key
+# trails behind it. TipPredictor extrapolates the tip forward by that delay
+# (the loop clock minus the frame's capture time, capped at max_lookahead for
+# a stalled frame, or a fixed lookahead taken as given), at the velocity of
+# the last few frames.
+#
+# Every prediction is scored once the finger has actually got there: the
+# observed tip is interpolated between the two frames either side of the
+# prediction's target time and the distance to the prediction recorded,
+# along with the distance from the stale, unpredicted tip for comparison.
+
+
+class TipPredictor():
+    def __init__(self, lookahead=None, max_lookahead=PREDICTION_MAX_MS / 1000, window=3, history=4096):
+        if lookahead is not None and lookahead < 0:
+            raise ValueError(f"Prediction lookahead must not be negative, got {lookahead * 1000:g} ms")
+        self.lookahead = lookahead          # Seconds to extrapolate by, None for the measured delay
+        self.max_lookahead = max_lookahead  # Cap on the measured delay, for a stalled frame
+        self.samples = deque(maxlen=window)  # (capture time, x, y) of the last frames
+        self.pending = deque()              # (target time, predicted x, y, stale x, y) awaiting scoring
+
+        # Ring buffers of scored predictions: predicted and stale tip errors in pixels
+        self.errors = np.zeros(history)
+        self.stale_errors = np.zeros(history)
+        self.count = 0
+
+    # Forget the hand: the next one starts from a standstill
+    def reset(self):
+        self.samples.clear()
+        self.pending.clear()
+
+    def _score(self, t, x, y):
+        if not self.samples:
+            return
+        t0, x0, y0 = self.samples[-1]
+        while self.pending and self.pending[0][0] <= t:
+            target, px, py, sx, sy = self.pending.popleft()
+            f = (target - t0) / (t - t0) if t > t0 else 1.0
+            ax, ay = x0 + (x - x0) * f, y0 + (y - y0) * f
+            i = self.count % len(self.errors)
+            self.errors[i] = hypot(px - ax, py - ay)
+            self.stale_errors[i] = hypot(sx - ax, sy - ay)
+            self.count += 1
+
+    # Predicted tip for a frame captured at frame_time, hit-tested at now
+    def update(self, tip, frame_time, now):
+        x, y = tip[0], tip[1]
+        self._score(frame_time, x, y)
+        self.samples.append((frame_time, x, y))
+
+        lookahead = self.lookahead
+        if lookahead is None:
+            lookahead = min(max(now - frame_time, 0.0), self.max_lookahead)
+        t0, x0, y0 = self.samples[0]
+        if lookahead <= 0 or frame_time <= t0:
+            return x, y
+        scale = lookahead / (frame_time - t0)
+        px, py = x + (x - x0) * scale, y + (y - y0) * scale
+        self.pending.append((frame_time + lookahead, px, py, x, y))
+        return int(round(px)), int(round(py))
+
+    # Mean and p95 of the predicted and stale tip errors, in pixels
+    def summary(self):
+        n = min(self.count, len(self.errors))
+        if n == 0:
+            return None
+        errors, stale = self.errors[:n], self.stale_errors[:n]
+        return {"count": self.count,
+                "mean_px": float(errors.mean()), "p95_px": float(np.percentile(errors, 95)),
+                "stale_mean_px": float(stale.mean()), "stale_p95_px": float(np.percentile(stale, 95))}
+
+    def report(self):
+        s = self.summary()
+        if s is None:
+            return ["Tip prediction: nothing to score"]
+        return [f"Tip prediction over {s['count']} frames: error mean {s['mean_px']:.1f} px, "
+                f"p95 {s['p95_px']:.1f} px (without: mean {s['stale_mean_px']:.1f} px, "
+                f"p95 {s['stale_p95_px']:.1f} px)"]
@@ -0,0 +1,275 @@
+import cv2
+
+from .config import (ACCENT, BRIGHT_TEXT, DARK_BG, GREEN, KEY_BORDER, KEY_DARK, KEY_LIGHT, KEY_PRESS,
+                     LIGHT_TEXT, RED, WHITE, YELLOW)
+from .gradients import corner_rect, draw_gloss, get_key_gradient
+from .static_layer import StaticLayer, layout_key
+from .text_sprites import put_boxed, put_glyphs, put_text
+
+# Renderers that draw the keyboard straight over the camera frame: the
+# classic style (main.py) and the same with a gradient text box
+# (fixed_main.py). The keys come from a cached layer composited with one
+# masked copy and the text box from a layer rebuilt only when the text
+# changes; hover, press and pinch feedback is drawn on top every frame.
+
+
+# Drawing Function - Modern Design
+def drawAll(img, buttonList):
+    for button in buttonList:
+        x, y = button.pos
+        w, h = button.size
+
+        # Modern design for all keys
+        # Draw key shadow for 3D effect
+        shadow_offset = 4
+        cv2.rectangle(img, (x+shadow_offset, y+shadow_offset),
+                     (x+w+shadow_offset, y+h+shadow_offset),
+                     (20, 20, 20), cv2.FILLED)
+
+        # Get gradient background based on key type
+        if button.text == "SPACE":
+            # Spacebar has horizontal gradient
+            img = get_key_gradient(img, x, y, w, h, KEY_DARK, KEY_LIGHT, vertical=False)
+        elif button.text == "⌫" or button.text == "⏎":
+            # Function keys with slight variation
+            accent_dark = (KEY_PRESS[0]//2, KEY_PRESS[1]//2, KEY_PRESS[2]//2)
+            img = get_key_gradient(img, x, y, w, h, accent_dark, KEY_DARK, vertical=True)
+        else:
+            # Standard key gradient
+            img = get_key_gradient(img, x, y, w, h, KEY_DARK, KEY_LIGHT, vertical=True)
+
+        # Add glossy effect at the top
+        img = draw_gloss(img, x, y, w, h, KEY_LIGHT)
+
+        # Add rounded corners with modern look
+        corner_radius = 15
+        corner_rect(img, (x, y, w, h), corner_radius, color=KEY_BORDER)
+
+        # Special cases for different key types
+        if button.text == "SPACE":
+            # Modern spacebar with subtle text
+            cv2.putText(img, "SPACE", (x + w//2 - 60, y + h//2 + 12),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.9, BRIGHT_TEXT, 2)  # Bright text
+        elif button.text == "⌫":
+            # Backspace button with improved design - clean left arrow
+            arrow_start = (x + w - 25, y + h//2)
+            arrow_end = (x + 25, y + h//2)
+
+            # Draw the main arrow
+            cv2.arrowedLine(img, arrow_start, arrow_end, BRIGHT_TEXT, 3, tipLength=0.3)
+
+            # Add a small vertical line at the right to complete the backspace symbol
+            cv2.line(img, (x + w - 25, y + h//2 - 15), (x + w - 25, y + h//2 + 15), BRIGHT_TEXT, 3)
+        elif button.text == "⏎":
+            # Enter key with arrow symbol
+            arrow_start = (x + 30, y + h//2)
+            arrow_end = (x + w - 20, y + h//2)
+
+            # Draw horizontal line
+            cv2.line(img, (x + 30, y + h//2 - 15), (x + 30, y + h//2), BRIGHT_TEXT, 3)
+
+            # Draw the return arrow
+            cv2.arrowedLine(img, arrow_start, arrow_end, BRIGHT_TEXT, 3, tipLength=0.3)
+        elif button.text == "←" or button.text == "↑" or button.text == "→" or button.text == "↓":
+            # Arrow keys centered with bright text
+            text_size = cv2.getTextSize(button.text, cv2.FONT_HERSHEY_PLAIN, 4, 4)[0]
+            text_x = x + (w - text_size[0])//2
+            text_y = y + h//2 + 15
+            cv2.putText(img, button.text, (text_x, text_y), cv2.FONT_HERSHEY_PLAIN, 4, BRIGHT_TEXT, 4)
+        else:
+            # Standard keys with better centering and modern font
+            text_size = cv2.getTextSize(button.text, cv2.FONT_HERSHEY_PLAIN, 4, 4)[0]
+            text_x = x + (w - text_size[0])//2
+            text_y = y + h//2 + 15
+            cv2.putText(img, button.text, (text_x, text_y), cv2.FONT_HERSHEY_PLAIN, 4, BRIGHT_TEXT, 4)
+
+            # Add a subtle highlight under each letter
+            cv2.putText(img, button.text, (text_x+1, text_y+1),
+                       cv2.FONT_HERSHEY_PLAIN, 4, (30, 30, 30), 1)
+
+    return img
+
+
+# Colours baked into the cached keyboard layer - changing any of them rebuilds it
+def keyboard_theme():
+    return (KEY_DARK, KEY_LIGHT, KEY_PRESS, KEY_BORDER, BRIGHT_TEXT)
+
+
+# Text box at the bottom of the screen, with as much of the end of the typed
+# text as fits in it
+def drawTextBox(img, textBuffer):
+    cv2.rectangle(img, (50, 550), (1200, 650), DARK_BG, cv2.FILLED)  # Dark background
+    cv2.rectangle(img, (50, 550), (1200, 650), ACCENT, 3)  # Accent border
+    displayText = textBuffer.visible(1130, cv2.FONT_HERSHEY_PLAIN, 4, 4)
+    # Draw the text with better visibility, from cached character sprites
+    put_glyphs(img, displayText, (60, 610),  # Position text in the middle of the box
+               cv2.FONT_HERSHEY_PLAIN, 4, WHITE, 4, background=DARK_BG)
+    return img
+
+
+# The same text box with modern styling: gradient background, thinner border
+def drawGradientTextBox(img, textBuffer):
+    # Create a gradient text box background
+    img = get_key_gradient(img, 50, 550, 1150, 100,
+                         (KEY_DARK[0]//2, KEY_DARK[1]//2, KEY_DARK[2]//2),
+                         KEY_DARK, vertical=False)
+
+    # Add border with accent color
+    cv2.rectangle(img, (50, 550), (1200, 650), ACCENT, 2)
+
+    # Draw the text with better visibility
+    displayText = textBuffer.visible(1130, cv2.FONT_HERSHEY_PLAIN, 4, 4)
+    cv2.putText(img, displayText, (60, 610),  # Position text in the middle of the box
+                cv2.FONT_HERSHEY_PLAIN, 4, WHITE, 4)
+    return img
+
+
+# Pressed key: blue face with the label or symbol in white
+def drawPressed(img, button):
+    x, y = button.pos
+    w, h = button.size
+    # Visual feedback (turn button blue when clicked)
+    cv2.rectangle(img, button.pos, (x + w, y + h), KEY_PRESS, cv2.FILLED)
+
+    # Keep consistent text positioning when clicked
+    if button.text == "SPACE":
+        put_text(img, button.text, (x + w//2 - 60, y + h//2 + 15),
+                 cv2.FONT_HERSHEY_PLAIN, 4, WHITE, 4, background=KEY_PRESS)
+    elif button.text == "⌫":
+        # Draw improved backspace symbol with white color
+        arrow_start = (x + w - 25, y + h//2)
+        arrow_end = (x + 25, y + h//2)
+
+        # Draw the main arrow line
+        cv2.arrowedLine(img, arrow_start, arrow_end, WHITE, 3, tipLength=0.3)
+
+        # Add a small vertical line at the right to complete the backspace symbol
+        cv2.line(img, (x + w - 25, y + h//2 - 15), (x + w - 25, y + h//2 + 15), WHITE, 3)
+    elif button.text == "⏎":
+        # Enter key with white arrow symbol
+        arrow_start = (x + 30, y + h//2)
+        arrow_end = (x + w - 20, y + h//2)
+
+        # Draw horizontal line
+        cv2.line(img, (x + 30, y + h//2 - 15), (x + 30, y + h//2), WHITE, 3)
+
+        # Draw the return arrow
+        cv2.arrowedLine(img, arrow_start, arrow_end, WHITE, 3, tipLength=0.3)
+    else:
+        # Arrow keys and standard keys with better centering
+        text_size = cv2.getTextSize(button.text, cv2.FONT_HERSHEY_PLAIN, 4, 4)[0]
+        text_x = x + (w - text_size[0])//2
+        text_y = y + h//2 + 15
+        put_text(img, button.text, (text_x, text_y), cv2.FONT_HERSHEY_PLAIN, 4, WHITE, 4,
+                 background=KEY_PRESS)
+    return img
+
+
+# Classic style: keyboard over the full camera frame
+class CameraRenderer():
+    title = "AI Virtual Keyboard - Modern Edition"
+    detector_display = None  # Landmarks in frame coordinates
+    drawTextBox = staticmethod(drawTextBox)
+
+    def __init__(self, keys, text):
+        self.keys = keys
+        self.text = text
+        # The keyboard is rendered once into a cached layer and composited onto every
+        # frame with a single masked copy; it is only repainted when the layout or theme changes
+        self.keyboardLayer = StaticLayer(drawAll)
+        # Text box layer - only repainted when the text changes
+        self.textBoxLayer = StaticLayer(self.drawTextBox, region=(46, 546, 1205, 655))
+
+    def render(self, state):
+        img = state.camera
+        gesture = state.gesture
+
+        # Draw keyboard from the cached layer
+        img = self.keyboardLayer.draw(img, (layout_key(self.keys), keyboard_theme()), self.keys)
+
+        if state.hands:
+            thumb_tip, index_tip = gesture.thumb_tip, gesture.index_tip
+            # Draw circles on fingertips for visual feedback
+            cv2.circle(img, (thumb_tip[0], thumb_tip[1]), 10, WHITE, cv2.FILLED)
+            cv2.circle(img, (index_tip[0], index_tip[1]), 10, WHITE, cv2.FILLED)
+
+            if gesture.measured:
+                # Draw line between thumb and index finger
+                cv2.line(img, (thumb_tip[0], thumb_tip[1]), (index_tip[0], index_tip[1]),
+                        ACCENT, 3)
+
+                # Add visual reference for vertical distance
+                midpoint_x = (thumb_tip[0] + index_tip[0]) // 2
+                cv2.line(img, (midpoint_x, thumb_tip[1]), (midpoint_x, index_tip[1]),
+                         GREEN, 2)
+
+                # Show distance measurements for debugging, on boxes of their own
+                # so they come from the sprite cache
+                put_boxed(img, f"V: {int(gesture.vertical_distance)}px", (45, 100),
+                          cv2.FONT_HERSHEY_PLAIN, 1.5, WHITE, 2, background=DARK_BG)
+                put_boxed(img, f"D: {int(gesture.euclidean_distance)}px", (45, 130),
+                          cv2.FONT_HERSHEY_PLAIN, 1.5, WHITE, 2, background=DARK_BG)
+
+            # Visual indicator for pinch detection status
+            if gesture.status:
+                text, color, thickness = gesture.status
+                put_boxed(img, text, (45, 180), cv2.FONT_HERSHEY_PLAIN, 2, color, thickness, background=DARK_BG)
+
+        if state.hit >= 0:
+            button = self.keys[state.hit]
+            x, y = button.pos
+            w, h = button.size
+
+            # Highlight button with lighter color when hovering
+            cv2.rectangle(img, (x - 5, y - 5), (x + w + 5, y + h + 5), KEY_LIGHT, cv2.FILLED)
+            put_text(img, button.text, (x + 20, y + 65),
+                     cv2.FONT_HERSHEY_PLAIN, 4, DARK_BG, 4, background=KEY_LIGHT)
+
+            if state.in_cooldown:
+                # Show cooldown progress bar
+                progress = int(state.cooldown_fraction * w)
+                cv2.rectangle(img, (x, y + h - 5), (x + progress, y + h), RED, cv2.FILLED)
+
+            if state.pressed >= 0:
+                img = drawPressed(img, button)
+
+            # Show "almost pinching" indicator
+            elif gesture.is_pinching:
+                # Show progress bar for pinch hold time
+                hold_progress = int((state.hold_fraction or 0.0) * w)
+                cv2.rectangle(img, (x, y + h - 5), (x + hold_progress, y + h), GREEN, cv2.FILLED)
+
+            # Show hover indicator when finger is over button but not pinching
+            elif gesture.is_pinching is not None and not state.in_cooldown:
+                cv2.rectangle(img, (x, y + h - 5), (x + w, y + h), YELLOW, cv2.FILLED)
+
+        # Display the text box - larger, more visible box at the bottom
+        img = self.textBoxLayer.draw(img, self.text.version, self.text)
+        # Add a label for the text box
+        put_boxed(img, "Your Text:", (60, 540),
+                  cv2.FONT_HERSHEY_PLAIN, 2, ACCENT, 2, background=DARK_BG)
+        # Add usage instructions at the top of the screen
+        cv2.rectangle(img, (50, 10), (1200, 40), DARK_BG, cv2.FILLED)
+        put_text(img, "Place index finger over key and HOLD pinch with thumb to type", (60, 30),
+                 cv2.FONT_HERSHEY_PLAIN, 1.5, LIGHT_TEXT, 2, background=DARK_BG)
+        put_text(img, "Press 'q' to quit", (950, 30),
+                 cv2.FONT_HERSHEY_PLAIN, 1.5, LIGHT_TEXT, 2, background=DARK_BG)
+
+        # Show pinch progress indicator at the top right corner (much smaller and out of the way)
+        if state.hold_fraction is not None:
+            # Small progress indicator that doesn't block the keyboard
+            progress_width = int(state.hold_fraction * 100)
+            cv2.rectangle(img, (1150, 50), (1150 + progress_width, 70), GREEN, cv2.FILLED)
+            cv2.rectangle(img, (1150, 50), (1250, 70), ACCENT, 2)
+            # Sits over the meter's own fill, which changes every frame - no sprite for that
+            cv2.putText(img, "PINCH", (1155, 65), cv2.FONT_HERSHEY_PLAIN, 1, WHITE, 1)
+        return img
+
+    # Nothing is retained between frames, so overdrawn areas need no bookkeeping
+    def mark(self, rect):
+        pass
+
+
+# fixed_main.py's style: the classic keyboard with a gradient text box
+class GradientRenderer(CameraRenderer):
+    drawTextBox = staticmethod(drawGradientTextBox)
@@ -0,0 +1,381 @@
+import cv2
+import numpy as np
+
+from .config import (ACCENT, BRIGHT_TEXT, DARK_BG, FRAME_SIZE, GREEN, KEY_BORDER, KEY_DARK, KEY_LIGHT,
+                     KEY_PRESS, LIGHT_TEXT, MAX_PARTICLES, PREVIEW_SIZE, RED, WHITE, YELLOW)
+from .frame_arena import FrameArena
+from .gradients import corner_rect, draw_gloss, get_key_gradient
+from .particles import ParticleSystem
+from .retained_canvas import RetainedCanvas
+from .text_sprites import put_boxed, put_text
+
+# Modern style (modernKeyboard.py): the keyboard on a dark background with the
+# camera feed as a small preview in the top right corner. Keys, text box and
+# instructions are retained-mode items of a RetainedCanvas and only repainted
+# when their state changes; the preview, particles and hand overlay are drawn
+# over the canvas every frame and restored on the next one.
+
+
+# How one key looks, with its press animation and status bars
+class KeyFace():
+    def __init__(self, key):
+        self.pos = key.pos
+        self.size = key.size
+        self.text = key.text
+        self.animation = 0  # For press animation
+        self.overlay = ()  # Status bars along the bottom edge as (color, width) pairs
+        self.pressed = False  # Stays set once the key has been pressed
+
+    # Area the key can paint into, including shadow, press offset and corner lines
+    def bounds(self):
+        x, y = self.pos
+        w, h = self.size
+        return (x - 4, y - 4, x + w + 12, y + h + 12)
+
+    # Everything that affects how the key looks - the canvas repaints it when this changes
+    def render_state(self):
+        return (self.pressed, min(5, self.animation // 2), self.overlay)
+
+    # Advance the press animation by one frame
+    def tick(self):
+        if self.animation > 0:
+            self.animation -= 1
+        return self.animation > 0
+
+    def draw(self, img):
+        x, y = self.pos
+        w, h = self.size
+
+        # Animation effect when key is pressed (3D press effect)
+        offset = min(5, self.animation // 2)
+
+        # Modern design for all keys
+        # Draw key shadow for 3D effect
+        shadow_offset = 4 + offset
+        if not self.pressed:
+            cv2.rectangle(img, (x+shadow_offset, y+shadow_offset),
+                        (x+w+shadow_offset, y+h+shadow_offset),
+                        (20, 20, 20), cv2.FILLED)
+
+        # Get gradient background based on key type
+        if self.pressed:
+            # Pressed state - different gradient
+            img = get_key_gradient(img, x+offset, y+offset, w, h,
+                                  KEY_PRESS, (KEY_PRESS[0]//2, KEY_PRESS[1]//2, KEY_PRESS[2]//2),
+                                  vertical=True)
+        elif self.text == "SPACE":
+            # Spacebar has horizontal gradient
+            img = get_key_gradient(img, x, y, w, h, KEY_DARK, KEY_LIGHT, vertical=False)
+        elif self.text == "⌫" or self.text == "⏎":
+            # Function keys with slight variation
+            accent_dark = (ACCENT[0]//2, ACCENT[1]//2, ACCENT[2]//2)
+            img = get_key_gradient(img, x, y, w, h, ACCENT, accent_dark, vertical=True)
+        elif self.text == "CTRL" or self.text == "ALT":
+            # Special function keys
+            img = get_key_gradient(img, x, y, w, h, (70, 75, 95), KEY_DARK, vertical=True)
+        elif self.text == "←" or self.text == "↑" or self.text == "→" or self.text == "↓":
+            # Arrow keys with distinct style
+            img = get_key_gradient(img, x, y, w, h, (90, 120, 90), (60, 80, 60), vertical=True)
+        else:
+            # Standard key gradient
+            img = get_key_gradient(img, x, y, w, h, KEY_DARK, KEY_LIGHT, vertical=True)
+
+        # Add glossy effect at the top
+        if not self.pressed:
+            img = draw_gloss(img, x, y, w, h, KEY_LIGHT)
+
+        # Add rounded corners with modern look
+        corner_radius = 15
+        corner_rect(img, (x+offset, y+offset, w, h), corner_radius, color=KEY_BORDER)
+
+        # Text color changes when pressed
+        text_color = WHITE if self.pressed else BRIGHT_TEXT
+
+        # Special cases for different key types
+        if self.text == "SPACE":
+            # Modern spacebar with subtle text and icon
+            cv2.line(img, (x+w//2-50, y+h//2), (x+w//2+50, y+h//2), text_color, 3)
+            cv2.putText(img, "SPACE", (x + w//2 - 60, y + h//2 + 25),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (text_color[0]//2, text_color[1]//2, text_color[2]//2), 2)
+        elif self.text == "⌫":
+            # Backspace button with improved design - clean left arrow
+            arrow_start = (x + w - 25 + offset, y + h//2 + offset)
+            arrow_end = (x + 25 + offset, y + h//2 + offset)
+            # Draw the main arrow
+            cv2.arrowedLine(img, arrow_start, arrow_end, text_color, 3, tipLength=0.3)
+            # Add a small vertical line at the right to complete the backspace symbol
+            cv2.line(img, (x + w - 25 + offset, y + h//2 - 15 + offset),
+                    (x + w - 25 + offset, y + h//2 + 15 + offset), text_color, 3)
+        elif self.text == "⏎":
+            # Enter key with arrow symbol
+            arrow_start = (x + 30 + offset, y + h//2 + offset)
+            arrow_end = (x + w - 20 + offset, y + h//2 + offset)
+            # Draw horizontal line
+            cv2.line(img, (x + 30 + offset, y + h//2 - 15 + offset),
+                    (x + 30 + offset, y + h//2 + offset), text_color, 3)
+            # Draw the return arrow
+            cv2.arrowedLine(img, arrow_start, arrow_end, text_color, 3, tipLength=0.3)
+        elif self.text == "←" or self.text == "↑" or self.text == "→" or self.text == "↓":
+            # Arrow keys centered with bright text
+            text_size = cv2.getTextSize(self.text, cv2.FONT_HERSHEY_PLAIN, 4, 4)[0]
+            text_x = x + offset + (w - text_size[0])//2
+            text_y = y + offset + h//2 + 15
+            cv2.putText(img, self.text, (text_x, text_y),
+                       cv2.FONT_HERSHEY_PLAIN, 4, text_color, 4)
+        elif self.text == "CTRL" or self.text == "ALT":
+            # Function keys with smaller font
+            text_size = cv2.getTextSize(self.text, cv2.FONT_HERSHEY_PLAIN, 2, 2)[0]
+            text_x = x + offset + (w - text_size[0])//2
+            text_y = y + offset + h//2 + 8
+            cv2.putText(img, self.text, (text_x, text_y),
+                       cv2.FONT_HERSHEY_PLAIN, 2, text_color, 2)
+        else:
+            # Standard keys with better centering and modern font
+            text_size = cv2.getTextSize(self.text, cv2.FONT_HERSHEY_PLAIN, 4, 4)[0]
+            text_x = x + offset + (w - text_size[0])//2
+            text_y = y + offset + h//2 + 15
+            cv2.putText(img, self.text, (text_x, text_y),
+                       cv2.FONT_HERSHEY_PLAIN, 4, text_color, 4)
+
+            # Add a subtle highlight under each letter for 3D effect
+            if not self.pressed:
+                cv2.putText(img, self.text, (text_x+1, text_y+1),
+                          cv2.FONT_HERSHEY_PLAIN, 4, (30, 30, 30), 1)
+
+        # Hover, hold and cooldown bars
+        for color, width in self.overlay:
+            cv2.rectangle(img, (x, y + h - 5), (x + width, y + h), color, cv2.FILLED)
+
+        return img
+
+
+# Text box at the bottom of the screen showing the typed text
+class TextBox():
+    def __init__(self, textBuffer):
+        self.textBuffer = textBuffer
+
+    def bounds(self):
+        return (46, 514, 1212, 662)
+
+    def render_state(self):
+        return self.textBuffer.version
+
+    def draw(self, img):
+        # Create a modern text display area with a futuristic design
+        # Drop shadow for text box
+        shadow_offset = 8
+        cv2.rectangle(img, (50+shadow_offset, 550+shadow_offset),
+                     (1200+shadow_offset, 650+shadow_offset), (20, 20, 20), cv2.FILLED)
+
+        # Main text box with gradient
+        img = get_key_gradient(img, 50, 550, 1150, 100,
+                               (KEY_DARK[0]//2, KEY_DARK[1]//2, KEY_DARK[2]//2),
+                               KEY_DARK, vertical=False)
+
+        # Border with accent color
+        cv2.rectangle(img, (50, 550), (1200, 650), ACCENT, 2)
+
+        # Add glowing accent corners for futuristic look
+        corner_size = 15
+        # Top left corner
+        cv2.line(img, (50, 550), (50+corner_size, 550), ACCENT, 3)
+        cv2.line(img, (50, 550), (50, 550+corner_size), ACCENT, 3)
+        # Top right corner
+        cv2.line(img, (1200, 550), (1200-corner_size, 550), ACCENT, 3)
+        cv2.line(img, (1200, 550), (1200, 550+corner_size), ACCENT, 3)
+        # Bottom left corner
+        cv2.line(img, (50, 650), (50+corner_size, 650), ACCENT, 3)
+        cv2.line(img, (50, 650), (50, 650-corner_size), ACCENT, 3)
+        # Bottom right corner
+        cv2.line(img, (1200, 650), (1200-corner_size, 650), ACCENT, 3)
+        cv2.line(img, (1200, 650), (1200, 650-corner_size), ACCENT, 3)
+
+        # Show as much of the end of the text as fits in the box
+        displayText = self.textBuffer.visible(1130, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 2)
+
+        # Draw the text with better visibility
+        cv2.putText(img, displayText, (60, 610),  # Position text in the middle of the box
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.5, WHITE, 2)
+
+        # Add a label for the text box
+        cv2.putText(img, "Your Text:", (60, 540),
+                    cv2.FONT_HERSHEY_PLAIN, 2, ACCENT, 2)
+        return img
+
+
+# Usage instructions bar along the top of the screen
+class InstructionBar():
+    def bounds(self):
+        return (18, 8, 1180, 52)
+
+    def render_state(self):
+        return None
+
+    def draw(self, img):
+        # Add modern usage instructions with futuristic design
+        instruction_y = 20
+        cv2.rectangle(img, (20, instruction_y-10), (700, instruction_y+30), (30, 30, 40), cv2.FILLED)
+        cv2.rectangle(img, (20, instruction_y-10), (700, instruction_y+30), KEY_BORDER, 1)
+        cv2.putText(img, "Place index finger over key & pinch with thumb to type", (30, instruction_y+15),
+                    cv2.FONT_HERSHEY_PLAIN, 1.2, LIGHT_TEXT, 2)
+
+        # Add quit instruction
+        cv2.putText(img, "Press 'q' to quit", (1000, instruction_y+15),
+                    cv2.FONT_HERSHEY_PLAIN, 1.2, LIGHT_TEXT, 2)
+        return img
+
+
+# Modern style: retained-mode keyboard with the camera feed in the corner
+class ModernRenderer():
+    title = "AI Virtual Keyboard - Modern Edition"
+
+    def __init__(self, keys, text, preview_size=PREVIEW_SIZE, max_particles=MAX_PARTICLES):
+        width, height = FRAME_SIZE
+        camera_w, camera_h = self.preview_size = preview_size
+        # Landmarks come back already mapped into the corner preview
+        self.detector_display = (width-20-camera_w, 20, camera_w, camera_h)
+
+        # Retained-mode canvas: keys, text box and instructions are painted into a
+        # persistent buffer and only repainted when their state changes
+        self.canvas = RetainedCanvas((height, width, 3), DARK_BG)
+        self.faces = [self.canvas.add(KeyFace(key)) for key in keys]
+        self.textBox = self.canvas.add(TextBox(text))
+        self.canvas.add(InstructionBar())
+
+        # Camera feed preview sits underneath the keys. The border never changes,
+        # so it is drawn once and every frame only resizes into the window inside it
+        self.arena = FrameArena()
+        self.preview_x, self.preview_y = width-20-camera_w-4, 16  # Includes room for the border
+        self.preview = self.arena.filled("preview", (camera_h+8, camera_w+8, 3), DARK_BG)
+        cv2.rectangle(self.preview, (2, 2), (camera_w+6, camera_h+6), KEY_BORDER, 2)
+        self.preview_window = self.preview[4:4+camera_h, 4:4+camera_w]
+        self.canvas.add_underlay_region((self.preview_x, self.preview_y,
+                                         self.preview_x+camera_w+8, self.preview_y+camera_h+8))
+
+        self.particles = ParticleSystem(max_particles)  # Press effects
+        self.hoveredFaces = []   # Keys showing a status bar last frame
+        self.animatedFaces = []  # Keys with a running press animation
+
+    def render(self, state):
+        canvas = self.canvas
+        gesture = state.gesture
+
+        # Make camera feed smaller for the corner preview, straight into its window
+        self.arena.resize(state.camera, self.preview_size, dst=self.preview_window)
+
+        # Advance press animations
+        for face in self.animatedFaces:
+            face.tick()
+            canvas.touch(face)
+        self.animatedFaces = [f for f in self.animatedFaces if f.animation > 0]
+
+        # Clear status bars from last frame
+        for face in self.hoveredFaces:
+            face.overlay = ()
+            canvas.touch(face)
+        self.hoveredFaces = []
+
+        if state.hit >= 0:
+            face = self.faces[state.hit]
+            x, y = face.pos
+            w, h = face.size
+            overlay = []
+
+            if state.in_cooldown:
+                # Show cooldown progress bar
+                overlay.append((RED, int(state.cooldown_fraction * w)))
+
+            if state.pressed >= 0:
+                face.animation = 10  # Start animation
+                face.pressed = True
+                self.animatedFaces.append(face)
+
+                # Create particle effect
+                self.particles.emit(x + w//2, y + h//2, KEY_PRESS, 20)
+                canvas.touch(self.textBox)  # Repainted if the text changed
+
+            # Show "almost pinching" indicator
+            elif gesture.is_pinching:
+                # Show progress bar for pinch hold time
+                overlay.append((GREEN, int((state.hold_fraction or 0.0) * w)))
+
+            # Show hover indicator when finger is over button but not pinching
+            elif gesture.is_pinching is not None and not state.in_cooldown:
+                overlay.append((YELLOW, w))
+
+            face.overlay = tuple(overlay)
+            self.hoveredFaces.append(face)
+            canvas.touch(face)
+
+        # Restore last frame's overlays and repaint whatever changed
+        img = canvas.begin_frame()
+        canvas.update()
+
+        # Place camera feed in top right corner with border
+        canvas.underlay(self.preview_x, self.preview_y, self.preview)
+
+        # Update and draw particles for visual effects - all of them in one step
+        self.particles.update()
+        self.particles.draw(img)
+        particle_bounds = self.particles.bounds()
+        if particle_bounds:
+            canvas.mark(*particle_bounds)
+
+        # Hand overlay is drawn over the canvas and restored next frame
+        if state.hands:
+            thumb_tip, index_tip = gesture.thumb_tip, gesture.index_tip
+            # Draw circles on fingertips for visual feedback
+            cv2.circle(img, (thumb_tip[0], thumb_tip[1]), 10, WHITE, cv2.FILLED)
+            cv2.circle(img, (index_tip[0], index_tip[1]), 10, WHITE, cv2.FILLED)
+            canvas.mark_points([thumb_tip, index_tip], 12)
+
+            if gesture.measured:
+                # Draw line between thumb and index finger with nice visual
+                cv2.line(img, (thumb_tip[0], thumb_tip[1]), (index_tip[0], index_tip[1]),
+                        (ACCENT[0], ACCENT[1], ACCENT[2], 150), 3)
+
+                # Add visual reference for vertical distance
+                midpoint_x = (thumb_tip[0] + index_tip[0]) // 2
+                cv2.line(img, (midpoint_x, thumb_tip[1]), (midpoint_x, index_tip[1]),
+                         GREEN, 2)
+
+                # Show distance measurements for debugging, on boxes of their own
+                # so they come from the sprite cache
+                for text, org in ((f"V: {int(gesture.vertical_distance)}px", (45, 100)),
+                                  (f"D: {int(gesture.euclidean_distance)}px", (45, 130))):
+                    canvas.mark(*put_boxed(img, text, org, cv2.FONT_HERSHEY_PLAIN, 1.5, LIGHT_TEXT, 2,
+                                           background=DARK_BG))
+
+            # Visual indicator for pinch detection status
+            if gesture.status:
+                text, color, thickness = gesture.status
+                canvas.mark(*put_boxed(img, text, (45, 180), cv2.FONT_HERSHEY_PLAIN, 2, color, thickness,
+                                       background=DARK_BG))
+
+        # Show pinch progress indicator as a circular meter
+        if state.hold_fraction is not None:
+            # Draw circular progress indicator
+            center = (60, 220)
+            radius = 30
+            # Background circle
+            cv2.circle(img, center, radius, (40, 40, 50), cv2.FILLED)
+            cv2.circle(img, center, radius, KEY_BORDER, 2)
+            # Progress arc
+            end_angle = int(360 * state.hold_fraction)
+            # Draw arc segments to simulate progress
+            for angle in range(0, end_angle, 6):
+                x1 = int(center[0] + radius * np.cos(np.radians(angle)))
+                y1 = int(center[1] + radius * np.sin(np.radians(angle)))
+                x2 = int(center[0] + radius * np.cos(np.radians(angle+5)))
+                y2 = int(center[1] + radius * np.sin(np.radians(angle+5)))
+                cv2.line(img, (x1, y1), (x2, y2), GREEN, 3)
+            # Label
+            put_text(img, "PINCH", (center[0]-25, center[1]+50), cv2.FONT_HERSHEY_PLAIN, 1.2, LIGHT_TEXT, 2,
+                     background=DARK_BG)  # Over the bare canvas
+            canvas.mark(center[0]-radius-3, center[1]-radius-3, center[0]+radius+4, center[1]+radius+4)
+            canvas.mark_text("PINCH", (center[0]-25, center[1]+50), cv2.FONT_HERSHEY_PLAIN, 1.2, 2)
+        return img
+
+    # Anything drawn over the frame afterwards is restored next frame
+    def mark(self, rect):
+        self.canvas.mark(*rect)
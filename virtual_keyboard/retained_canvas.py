@@ -0,0 +1,145 @@
+import cv2
+import numpy as np
+
+# Retained-mode renderer. Items (keys, text box, instruction bar) are painted
+# into a persistent base canvas and only repainted when their render state
+# changes. Everything drawn per frame on top of it (hand overlay, particles,
+# status text) is marked and restored from the base on the next frame, so the
+# cost of a frame depends on what changed, not on how many keys there are.
+#
+# An item needs three methods:
+#   bounds()        -> (x0, y0, x1, y1) covering everything the item can draw
+#   render_state()  -> hashable value; a change means the item must be repainted
+#   draw(img)       -> paints the item in absolute frame coordinates
+class RetainedCanvas():
+    CELL = 64  # Spatial hash cell size for finding items under a dirty rectangle
+
+    def __init__(self, shape, background):
+        self.shape = shape
+        self.background = np.array(background, np.uint8)
+        self.base = np.empty(shape, np.uint8)       # Retained items over the background
+        self.base[:] = self.background
+        self.frame = self.base.copy()               # What gets shown this frame
+        self.scratch = self.base.copy()             # Repaint area for dirty rectangles
+        self.probe = self.base.copy()               # Second background for coverage masks
+        self.coverage = np.zeros(shape[:2], np.uint8)  # 255 where an item painted the pixel
+
+        self.items = []
+        self.states = []
+        self.index = {}       # id(item) -> z-order index
+        self.cells = {}       # (cx, cy) -> list of item indices
+        self.touched = set()  # Items whose state may have changed since the last update
+        self.marks = []       # Transient rectangles drawn over the frame this frame
+        self.underlay_regions = []
+        self.full_repaint = True
+        self.repaints = 0     # Number of dirty rectangles repainted so far
+
+    def _clip(self, rect):
+        x0, y0, x1, y1 = rect
+        h, w = self.shape[:2]
+        return max(int(x0), 0), max(int(y0), 0), min(int(x1), w), min(int(y1), h)
+
+    def _cells(self, rect):
+        x0, y0, x1, y1 = rect
+        for cy in range(y0 // self.CELL, (y1 - 1) // self.CELL + 1):
+            for cx in range(x0 // self.CELL, (x1 - 1) // self.CELL + 1):
+                yield (cx, cy)
+
+    def add(self, item):
+        i = len(self.items)
+        self.items.append(item)
+        self.states.append(None)
+        self.index[id(item)] = i
+        rect = self._clip(item.bounds())
+        if rect[0] < rect[2] and rect[1] < rect[3]:
+            for cell in self._cells(rect):
+                self.cells.setdefault(cell, []).append(i)
+        self.full_repaint = True
+        return item
+
+    # Region where an image is shown underneath the retained items (camera preview)
+    def add_underlay_region(self, rect):
+        self.underlay_regions.append(self._clip(rect))
+        self.full_repaint = True
+
+    # Tell the canvas an item's state may have changed
+    def touch(self, item):
+        self.touched.add(self.index[id(item)])
+
+    # Register a rectangle drawn directly onto the frame; it is restored next frame
+    def mark(self, x0, y0, x1, y1):
+        self.marks.append(self._clip((x0, y0, x1, y1)))
+
+    def mark_text(self, text, org, font, scale, thickness):
+        (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+        self.mark(org[0] - thickness, org[1] - h - thickness,
+                  org[0] + w + thickness, org[1] + baseline + thickness)
+
+    def mark_points(self, points, pad):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.mark(min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1)
+
+    # Restore last frame's transient drawings from the base canvas
+    def begin_frame(self):
+        for x0, y0, x1, y1 in self.marks:
+            if x0 < x1 and y0 < y1:
+                self.frame[y0:y1, x0:x1] = self.base[y0:y1, x0:x1]
+        self.marks = []
+        return self.frame
+
+    def _repaint(self, rect):
+        x0, y0, x1, y1 = self._clip(rect)
+        if x0 >= x1 or y0 >= y1:
+            return
+        candidates = set()
+        for cell in self._cells((x0, y0, x1, y1)):
+            candidates.update(self.cells.get(cell, ()))
+        hits = []
+        for i in sorted(candidates):
+            ix0, iy0, ix1, iy1 = self.items[i].bounds()
+            if ix0 < x1 and x0 < ix1 and iy0 < y1 and y0 < iy1:
+                hits.append(self.items[i])
+
+        self.scratch[y0:y1, x0:x1] = self.background
+        for item in hits:
+            item.draw(self.scratch)
+
+        # Pixel coverage is only needed where something shows through underneath.
+        # Painting again over the inverted background marks the pixels items touched
+        if any(ux0 < x1 and x0 < ux1 and uy0 < y1 and y0 < uy1
+               for ux0, uy0, ux1, uy1 in self.underlay_regions):
+            self.probe[y0:y1, x0:x1] = 255 - self.background
+            for item in hits:
+                item.draw(self.probe)
+            same = np.all(self.scratch[y0:y1, x0:x1] == self.probe[y0:y1, x0:x1], axis=2)
+            self.coverage[y0:y1, x0:x1] = same.view(np.uint8) * 255
+
+        self.base[y0:y1, x0:x1] = self.scratch[y0:y1, x0:x1]
+        self.frame[y0:y1, x0:x1] = self.base[y0:y1, x0:x1]
+        self.repaints += 1
+
+    # Repaint every touched item whose render state actually changed
+    def update(self):
+        if self.full_repaint:
+            self.states = [item.render_state() for item in self.items]
+            self.touched.clear()
+            self.full_repaint = False
+            self._repaint((0, 0, self.shape[1], self.shape[0]))
+            return
+
+        dirty = []
+        for i in self.touched:
+            state = self.items[i].render_state()
+            if state != self.states[i]:
+                self.states[i] = state
+                dirty.append(self.items[i].bounds())
+        self.touched.clear()
+        for rect in dirty:
+            self._repaint(rect)
+
+    # Show image at (x, y) underneath the retained items
+    def underlay(self, x, y, image):
+        h, w = image.shape[:2]
+        self.frame[y:y+h, x:x+w] = image
+        cv2.copyTo(self.base[y:y+h, x:x+w], self.coverage[y:y+h, x:x+w], self.frame[y:y+h, x:x+w])
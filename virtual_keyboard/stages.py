@@ -0,0 +1,54 @@
+# Stage interfaces of the keyboard pipeline. Every frame goes
+#
+#   Capture -> Detect -> Gesture -> Layout/HitTest -> Render -> Output
+#
+# and each stage is a plain object with the methods below, so any of them can
+# be swapped for another implementation (a threaded or direct camera, a
+# recorded trace, a cached or immediate renderer, a null output) and
+# benchmarked against it.
+#
+# Capture   read() -> (success, img), release(); optional last_timestamp
+#           (capture time of the returned frame) and finished (source
+#           exhausted). camera_capture.ThreadedCapture, cv2.VideoCapture,
+#           headless.VideoReplay and headless.TraceReplay.
+#
+# Detect    findHands(img, draw=False) -> (hands, img), cvzone's hand dicts
+#           in screen coordinates. hand_tracking.create_detector builds the
+#           usual chain; headless.TraceReplay replays recorded hands.
+#
+# Gesture   update(hands, frame_time) with the pinch measurements as
+#           attributes afterwards: index_tip, is_pinching, measured, status,
+#           trigger (the engine's pinching input), ... gesture.PinchGesture.
+#           Hold and cooldown timing is a pure state machine next to it,
+#           gesture_engine.GestureEngine: step(state, now, key, pinching)
+#           -> state, hold_fraction(state, now) and cooldown_fraction(state,
+#           now).
+#
+# HitTest   keys, hit_test(x, y) -> key index or -1, lookup(x, y) (the
+#           same without counting a hover), press(index), reset_pressed().
+#           layout.Keyboard.
+#
+# Render    render(state) -> img for a FrameState, mark(rect) for anything
+#           drawn over the returned image afterwards (the HUD), title and
+#           detector_display (the (x, y, w, h) screen rectangle landmarks are
+#           mapped into, None for the full frame). Built as
+#           Renderer(keys, text) - see render_camera.py and render_modern.py.
+#
+# Output    submit(key, tag=None), close(). key_output.KeyInjector,
+#           key_output.NullOutput, headless.recording_output().
+
+
+# Everything the renderer needs to know about one frame
+class FrameState():
+    __slots__ = ("camera", "hands", "gesture", "hit", "in_cooldown", "cooldown_fraction", "hold_fraction",
+                 "pressed")
+
+    def __init__(self, camera, hands, gesture):
+        self.camera = camera          # Flipped camera frame
+        self.hands = hands
+        self.gesture = gesture        # The Gesture stage, updated for this frame
+        self.hit = -1                 # Key under the index fingertip
+        self.in_cooldown = False      # Whether that key is still cooling down
+        self.cooldown_fraction = 0.0  # Fraction of its cooldown still to go
+        self.hold_fraction = None     # Fraction of the pinch hold done, None with no pinch under way
+        self.pressed = -1             # Key committed on this frame
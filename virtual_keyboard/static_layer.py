@@ -0,0 +1,96 @@
+import cv2
+import numpy as np
+
+# Cached render of UI elements that almost never change (keyboard keys,
+# labels, borders). The painter runs once onto two different backgrounds:
+# every pixel it touched comes out identical in both, every pixel it left
+# alone does not. That gives an exact mask without having to track each
+# individual OpenCV primitive.
+#
+# With a region (x0, y0, x1, y1) only that rectangle is compared, and every
+# buffer of a build - the two paint buffers, the comparison and the mask - is
+# kept and reused, with the layer and mask left as views into them. That is
+# for layers that are rebuilt now and then (the text box on every keystroke)
+# rather than once, so a rebuild allocates no image memory. Anything the
+# painter draws outside the region is left out.
+class StaticLayer():
+    def __init__(self, paint, region=None):
+        self.paint = paint    # paint(canvas, *args) -> canvas
+        self.region = region
+        self.scratch = None   # (dark, light, equal, mask) buffers when a region is set
+        self.key = None       # Cache key of the current layer
+        self.layer = None     # BGR pixels of the layer (cropped to its bounding box)
+        self.mask = None      # uint8 mask of painted pixels (255 = painted)
+        self.roi = None       # (x0, y0, x1, y1) of the layer in frame coordinates
+        self.builds = 0       # Number of times the layer has been rendered
+
+    def _buffers(self, shape):
+        if self.region is None:
+            return np.zeros(shape, np.uint8), np.full(shape, 255, np.uint8), (0, 0)
+        if self.scratch is None or self.scratch[0].shape != shape:
+            x0, y0, x1, y1 = self.region
+            size = (y1 - y0, x1 - x0)
+            self.scratch = (np.empty(shape, np.uint8), np.empty(shape, np.uint8),
+                            np.empty(size + shape[2:], bool), np.empty(size, np.uint8))
+        dark, light = self.scratch[:2]
+        x0, y0, x1, y1 = self.region
+        dark[y0:y1, x0:x1] = 0
+        light[y0:y1, x0:x1] = 255
+        return dark, light, (x0, y0)
+
+    # Mask of the pixels the painter touched: a fresh array, or with a region
+    # the kept buffer, 255 where painted
+    def _compare(self, dark, light):
+        if self.region is None:
+            return np.all(dark == light, axis=2).astype(np.uint8) * 255
+        equal, mask = self.scratch[2:]
+        np.equal(dark, light, out=equal)
+        np.all(equal, axis=2, out=mask)
+        np.multiply(mask, 255, out=mask)
+        return mask
+
+    def build(self, shape, *args):
+        dark, light, (ox, oy) = self._buffers(shape)
+        dark = self.paint(dark, *args)
+        light = self.paint(light, *args)
+        if self.region is not None:
+            x0, y0, x1, y1 = self.region
+            dark, light = dark[y0:y1, x0:x1], light[y0:y1, x0:x1]
+        mask = self._compare(dark, light)
+
+        # Crop to the painted area so compositing only touches those rows/cols
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if len(rows) == 0:
+            self.layer, self.mask, self.roi = None, None, None
+        else:
+            y0, y1 = rows[0], rows[-1] + 1
+            x0, x1 = cols[0], cols[-1] + 1
+            self.layer = dark[y0:y1, x0:x1]
+            self.mask = mask[y0:y1, x0:x1]
+            if self.region is None:
+                # Don't hold on to the whole frame-sized buffers
+                self.layer, self.mask = self.layer.copy(), self.mask.copy()
+            self.roi = (x0 + ox, y0 + oy, x1 + ox, y1 + oy)
+        self.builds += 1
+
+    def invalidate(self):
+        self.key = None
+
+    # Composite the cached layer onto img, rebuilding it first if the key changed
+    def draw(self, img, key, *args):
+        key = (img.shape, key)
+        if key != self.key:
+            self.build(img.shape, *args)
+            self.key = key
+
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            # cv2.copyTo writes straight into the ROI view of img
+            cv2.copyTo(self.layer, self.mask, img[y0:y1, x0:x1])
+        return img
+
+
+# Cache key describing a button layout - position, size and label of every key
+def layout_key(buttonList):
+    return tuple((tuple(b.pos), tuple(b.size), b.text) for b in buttonList)
@@ -0,0 +1,91 @@
+from itertools import chain
+
+from .key_output import SPECIAL_KEYS
+from .text_sprites import glyph_advance
+
+# Text typed so far, as a gap buffer: the characters live in one list with a
+# gap at the cursor, so typing and backspacing at the cursor never copy the
+# text (the gap doubles when it runs out). version goes up on every change,
+# which is what the text box uses to decide whether it has to be redrawn.
+class TextBuffer():
+    def __init__(self, text="", capacity=64):
+        self.chars = [""] * max(capacity, 2 * len(text))
+        self.gap_start = 0               # Cursor position
+        self.gap_end = len(self.chars)
+        self.version = 0
+        self.insert(text)
+        self.version = 0
+        self.window = None               # (version, width, font, scale, thickness) -> visible text
+
+    def __len__(self):
+        return len(self.chars) - (self.gap_end - self.gap_start)
+
+    def __str__(self):
+        return "".join(self.chars[:self.gap_start]) + "".join(self.chars[self.gap_end:])
+
+    def _grow(self, needed):
+        extra = max(len(self.chars), needed)
+        self.chars[self.gap_end:self.gap_end] = [""] * extra
+        self.gap_end += extra
+
+    def insert(self, text):
+        if not text:
+            return
+        if self.gap_end - self.gap_start < len(text):
+            self._grow(len(text))
+        self.chars[self.gap_start:self.gap_start + len(text)] = text
+        self.gap_start += len(text)
+        self.version += 1
+
+    # Delete the character before the cursor
+    def backspace(self):
+        if self.gap_start == 0:
+            return
+        self.gap_start -= 1
+        self.chars[self.gap_start] = ""
+        self.version += 1
+
+    # Move the cursor by offset characters, carrying them across the gap
+    def move_cursor(self, offset):
+        offset = max(-self.gap_start, min(offset, len(self.chars) - self.gap_end))
+        if offset < 0:
+            n = -offset
+            self.chars[self.gap_end - n:self.gap_end] = self.chars[self.gap_start - n:self.gap_start]
+            self.gap_start -= n
+            self.gap_end -= n
+        elif offset > 0:
+            self.chars[self.gap_start:self.gap_start + offset] = self.chars[self.gap_end:self.gap_end + offset]
+            self.gap_start += offset
+            self.gap_end += offset
+
+    # How a virtual key press changes the text shown in the text box
+    def type_key(self, key):
+        if key == "⌫":
+            self.backspace()
+        elif key == "SPACE":
+            self.insert(" ")
+        elif key == "⏎":
+            self.insert("\n")  # Visual representation in text box
+        elif key not in SPECIAL_KEYS:
+            self.insert(key)
+
+    # The longest tail of the current line that fits in width pixels when drawn
+    # with cv2.putText, measured from the cached per-character advances. The
+    # box is one line high and putText breaks lines at "\n", so the window
+    # starts after the last one.
+    def visible(self, width, font, scale, thickness=1):
+        key = (self.version, width, font, scale, thickness)
+        if self.window is None or self.window[0] != key:
+            used = thickness  # Stroke overhang past the last advance
+            start = len(self.chars)
+            # Walk back from the end, jumping over the gap
+            for i in chain(range(len(self.chars) - 1, self.gap_end - 1, -1), range(self.gap_start - 1, -1, -1)):
+                if self.chars[i] == "\n":
+                    break
+                used += glyph_advance(self.chars[i], font, scale, thickness)
+                if used > width:
+                    break
+                start = i
+            head = self.chars[start:self.gap_start] if start < self.gap_start else []
+            self.window = (key, "".join(head) + "".join(self.chars[max(start, self.gap_end):]))
+        return self.window[1]
@@ -0,0 +1,107 @@
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+# Pre-rasterized text for text drawn over a solid background. Every string is
+# rendered once with cv2.putText onto that background, cropped to the pixels
+# the text touches, and drawn afterwards with one masked copy. Sprites are kept
+# in an LRU cache keyed by (text, font, scale, thickness, colour, background).
+#
+# putText anti-aliases, so a sprite is only exact over the background it was
+# rendered on. Text that would sit over the camera image or the keys gets a
+# solid box of its own behind it (put_boxed), the way the instruction bar
+# does: blending an alpha mask from Python costs more than OpenCV's own
+# rasterizer.
+#
+# Readouts whose text changes every frame are composed from cached
+# single-character sprites instead of caching every string. Hershey glyphs
+# advance by whole pixels, so the composed text matches putText's.
+
+
+def _color(color):
+    return tuple(int(c) for c in color)
+
+
+# Same result as cv2.getTextSize, cached
+@lru_cache(maxsize=1024)
+def text_size(text, font, scale, thickness=1):
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
+# Horizontal advance of one character in pixels
+@lru_cache(maxsize=1024)
+def glyph_advance(char, font, scale, thickness=1):
+    return text_size(char * 2, font, scale, thickness)[0][0] - text_size(char, font, scale, thickness)[0][0]
+
+
+# (tile, mask, dx, dy): the text rendered over background and the mask of the
+# pixels it changed, with the tile's top left corner at org + (dx, dy).
+# None for text without any ink (spaces).
+@lru_cache(maxsize=2048)  # Room for every V:/D: readout value besides the labels
+def text_sprite(text, font, scale, thickness, color, background):
+    (w, h), baseline = text_size(text, font, scale, thickness)
+    pad = 2 * thickness + 2
+    alpha = np.zeros((h + baseline + 2 * pad, w + 2 * pad), np.uint8)
+    cv2.putText(alpha, text, (pad, pad + h), font, scale, 255, thickness)
+    # Bounding box of the ink, without the coordinate arrays np.nonzero builds
+    x0, y0, bw, bh = cv2.boundingRect(alpha)
+    if bw == 0:
+        return None
+    x1, y1 = x0 + bw, y0 + bh
+    tile = np.empty((bh, bw, 3), np.uint8)
+    tile[:] = background
+    cv2.putText(tile, text, (pad - x0, pad + h - y0), font, scale, color, thickness)
+    return tile, alpha[y0:y1, x0:x1], int(x0 - pad), int(y0 - pad - h)
+
+
+def _blit(img, sprite, x, y):
+    tile, mask, dx, dy = sprite
+    x, y = x + dx, y + dy
+    h, w = mask.shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, img.shape[1]), min(y + h, img.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    sx, sy = x0 - x, y0 - y
+    cv2.copyTo(tile[sy:sy + y1 - y0, sx:sx + x1 - x0], mask[sy:sy + y1 - y0, sx:sx + x1 - x0],
+               img[y0:y1, x0:x1])
+
+
+# Drop-in for cv2.putText. With the colour of the solid background the text
+# sits on it draws from the sprite cache; without one it is plain putText.
+def put_text(img, text, org, font, scale, color, thickness=1, background=None):
+    if background is None:
+        return cv2.putText(img, text, org, font, scale, color, thickness)
+    sprite = text_sprite(text, font, scale, thickness, _color(color), _color(background))
+    if sprite is not None:
+        _blit(img, sprite, int(org[0]), int(org[1]))
+    return img
+
+
+# Like put_text, but built from per-character sprites - for text that keeps changing
+def put_glyphs(img, text, org, font, scale, color, thickness=1, background=None):
+    if background is None:
+        return cv2.putText(img, text, org, font, scale, color, thickness)
+    color, background = _color(color), _color(background)
+    x, y = int(org[0]), int(org[1])
+    for char in text:
+        sprite = text_sprite(char, font, scale, thickness, color, background)
+        if sprite is not None:
+            _blit(img, sprite, x, y)
+        x += glyph_advance(char, font, scale, thickness)
+    return img
+
+
+# Text on a solid box of background filled in behind it, for text with no
+# fixed background of its own. Whole-string sprites, so it matches putText
+# exactly even for readouts (glyph sprites differ where anti-aliased edges of
+# neighbouring characters meet). Returns the (x0, y0, x1, y1) the box covers
+def put_boxed(img, text, org, font, scale, color, thickness=1, background=(0, 0, 0)):
+    (w, h), baseline = text_size(text, font, scale, thickness)
+    pad = thickness + 2
+    x, y = int(org[0]), int(org[1])
+    x0, y0, x1, y1 = x - pad, y - h - pad, x + w + pad, y + baseline + pad
+    cv2.rectangle(img, (x0, y0), (x1 - 1, y1 - 1), background, cv2.FILLED)
+    put_text(img, text, org, font, scale, color, thickness, background=background)
+    return x0, y0, x1, y1